@@ -0,0 +1,54 @@
+"""
+Memory held by parse results: slotted records vs the equivalent plain dicts.
+
+Usage:
+    python -m benchmarks.bench_records [path]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from core.parser.python_parser import parse_path
+from core.parser.records import to_jsonable
+
+
+def _as_dicts(results):
+    return [
+        {
+            **f,
+            "functions": [to_jsonable(fn) if not isinstance(fn, dict) else fn for fn in f["functions"]],
+            "classes": [to_jsonable(c) if not isinstance(c, dict) else c for c in f["classes"]],
+        }
+        for f in results
+    ]
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current
+
+
+def run(path: str) -> dict:
+    # warm-up so one-time allocations (imports, caches) are not attributed to either side
+    parse_path(path)
+    records, records_bytes = _measure(lambda: parse_path(path))
+    # the records are dropped after conversion, so only the dict form is retained
+    dicts, dicts_bytes = _measure(lambda: _as_dicts(parse_path(path)))
+    n_funcs = sum(len(f["functions"]) for f in records)
+    return {
+        "path": path,
+        "files": len(records),
+        "functions": n_funcs,
+        "records_bytes": records_bytes,
+        "dicts_bytes": dicts_bytes,
+        "reduction_percent": round((1 - records_bytes / dicts_bytes) * 100, 1) if dicts_bytes else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    print(run(sys.argv[1] if len(sys.argv) > 1 else "examples"))
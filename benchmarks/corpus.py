@@ -0,0 +1,165 @@
+"""
+Synthetic Python repositories for benchmarks.
+
+The same config and seed always produce byte-identical files, so timings
+from different runs (or branches) are measured on the same input.
+
+Usage:
+    python -m benchmarks.corpus <out_dir> [--files N] [--seed S] ...
+"""
+
+import argparse
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+_TYPES = ["int", "str", "float", "bool", "List[int]", "Dict[str, Any]", "Optional[str]"]
+_DEFAULTS = ["None", "0", "1.5", "''", "True", "()"]
+_EXCEPTIONS = ["ValueError", "KeyError", "TypeError", "RuntimeError"]
+_WORDS = [
+    "load", "parse", "merge", "build", "fetch", "render", "compute", "resolve",
+    "record", "index", "token", "buffer", "report", "config", "cache", "node",
+]
+
+
+@dataclass
+class CorpusConfig:
+    """Size and shape of a generated repository."""
+
+    files: int = 200
+    package_depth: int = 3
+    files_per_package: int = 20
+    functions_per_file: int = 12
+    classes_per_file: int = 2
+    methods_per_class: int = 4
+    nesting_depth: int = 4
+    docstring_ratio: float = 0.6
+    seed: int = 1234
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class _Writer:
+    def __init__(self, config: CorpusConfig, rng: random.Random):
+        self.config = config
+        self.rng = rng
+        self.counter = 0
+
+    def name(self) -> str:
+        self.counter += 1
+        return f"{self.rng.choice(_WORDS)}_{self.rng.choice(_WORDS)}_{self.counter}"
+
+    def docstring(self, indent: str, name: str) -> List[str]:
+        if self.rng.random() >= self.config.docstring_ratio:
+            return []
+        return [f'{indent}"""', f"{indent}{name.replace('_', ' ').capitalize()}.", f'{indent}"""']
+
+    def body(self, indent: str, depth: int) -> List[str]:
+        # one branch per level down to depth, with a loop, a raise and a yield mixed in
+        lines = [f"{indent}total = 0"]
+        pad = indent
+        for level in range(depth):
+            kind = self.rng.choice(("if", "for", "while", "try"))
+            if kind == "if":
+                lines.append(f"{pad}if value > {level}:")
+            elif kind == "for":
+                lines.append(f"{pad}for i{level} in range({level + 2}):")
+            elif kind == "while":
+                lines.append(f"{pad}while total < {level + 3}:")
+            else:
+                lines.append(f"{pad}try:")
+                lines.append(f"{pad}    total += {level}")
+                lines.append(f"{pad}except {self.rng.choice(_EXCEPTIONS)}:")
+            pad += "    "
+            lines.append(f"{pad}total += {level + 1}")
+        if self.rng.random() < 0.3:
+            lines.append(f"{pad}raise {self.rng.choice(_EXCEPTIONS)}('bad value')")
+        lines.append(f"{indent}return total")
+        return lines
+
+    def function(self, indent: str, method: bool = False) -> List[str]:
+        name = self.name()
+        params = ["self"] if method else []
+        for i in range(self.rng.randint(0, 4)):
+            param = f"arg{i}: {self.rng.choice(_TYPES)}"
+            if i >= 2:
+                param += f" = {self.rng.choice(_DEFAULTS)}"
+            params.append(param)
+        params.append("value: int = 0")
+        lines = []
+        if method and self.rng.random() < 0.2:
+            lines.append(f"{indent}@classmethod")
+            params[0] = "cls"
+        lines.append(f"{indent}def {name}({', '.join(params)}) -> int:")
+        lines += self.docstring(indent + "    ", name)
+        lines += self.body(indent + "    ", self.rng.randint(1, self.config.nesting_depth))
+        return lines + [""]
+
+    def klass(self) -> List[str]:
+        name = "".join(w.capitalize() for w in self.name().split("_"))
+        lines = [f"class {name}(object):"]
+        lines += self.docstring("    ", name)
+        for _ in range(self.config.methods_per_class):
+            lines += self.function("    ", method=True)
+        return lines + [""]
+
+    def module(self) -> str:
+        lines = ['"""Generated module."""', "", "from typing import Any, Dict, List, Optional", "", ""]
+        for _ in range(self.config.functions_per_file):
+            lines += self.function("")
+            lines.append("")
+        for _ in range(self.config.classes_per_file):
+            lines += self.klass()
+            lines.append("")
+        return "\n".join(lines).rstrip() + "\n"
+
+
+def _package_dir(root: str, index: int, config: CorpusConfig) -> str:
+    # files are spread over packages nested package_depth levels deep
+    package = index // max(config.files_per_package, 1)
+    parts = []
+    for level in range(config.package_depth):
+        parts.append(f"pkg{level}_{package % 4}")
+        package //= 4
+    return os.path.join(root, *parts)
+
+
+def generate_corpus(root: str, config: CorpusConfig) -> List[str]:
+    """
+    Write a synthetic repository under root and return the file paths.
+    """
+    rng = random.Random(config.seed)
+    writer = _Writer(config, rng)
+    paths = []
+    for index in range(config.files):
+        directory = _package_dir(root, index, config)
+        os.makedirs(directory, exist_ok=True)
+        init = os.path.join(directory, "__init__.py")
+        if not os.path.exists(init):
+            open(init, "w", encoding="utf-8").close()
+        path = os.path.join(directory, f"module_{index}.py")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(writer.module())
+        paths.append(path)
+    return paths
+
+
+def add_config_args(parser: argparse.ArgumentParser) -> None:
+    """Expose every CorpusConfig field as a --option."""
+    for field, default in CorpusConfig().to_dict().items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=default)
+
+
+def config_from_args(args: argparse.Namespace) -> CorpusConfig:
+    return CorpusConfig(**{field: getattr(args, field) for field in CorpusConfig().to_dict()})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.corpus")
+    parser.add_argument("out_dir")
+    add_config_args(parser)
+    args = parser.parse_args()
+    files = generate_corpus(args.out_dir, config_from_args(args))
+    print(f"Wrote {len(files)} files to {args.out_dir}")
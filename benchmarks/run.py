@@ -0,0 +1,151 @@
+"""
+Pipeline benchmark on a synthetic corpus.
+
+Times parse_path (full and coverage-only), compute_coverage,
+validate_docstrings, compute_complexity and docstring formatting, records
+the peak memory of each stage, and writes everything to a JSON file so runs
+can be compared over time.
+
+Usage:
+    python -m benchmarks.run [--files N] [--seed S] [--repeat R] [--out results.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from benchmarks import bench_records
+from benchmarks.corpus import CorpusConfig, add_config_args, config_from_args, generate_corpus
+from core.docstring_engine.generator import (
+    generate_google_docstring,
+    generate_numpy_docstring,
+    generate_rest_docstring,
+)
+from core.parser.python_parser import parse_path
+from core.reporter.coverage_reporter import compute_coverage
+from core.validator.validator import compute_complexity, validate_docstrings
+
+DEFAULT_RESULTS_DIR = os.path.join("storage", "benchmarks")
+
+# stands in for the LLM response so formatting is measured on its own
+_LLM_CONTENT = {
+    "summary": "Compute the total for the given value.",
+    "args": {"value": "Upper bound.", "arg0": "First input."},
+    "returns": "The computed total.",
+    "raises": {"ValueError": "If the value is invalid."},
+}
+
+
+def _measure(stage: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    # timed without tracemalloc (it slows allocation-heavy code), then once traced for the peak
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        stage()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds_min": round(min(times), 6),
+        "seconds_mean": round(sum(times) / len(times), 6),
+        "peak_memory_bytes": peak,
+    }
+
+
+def _read_sources(files: List[str]) -> List[str]:
+    sources = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as fh:
+            sources.append(fh.read())
+    return sources
+
+
+def _format_all(functions: List[Any]) -> None:
+    for fn in functions:
+        generate_google_docstring(fn, _LLM_CONTENT)
+        generate_numpy_docstring(fn, _LLM_CONTENT)
+        generate_rest_docstring(fn, _LLM_CONTENT)
+
+
+def run(config: CorpusConfig, repeat: int = 3, jobs: int = 1, corpus_dir: str = None) -> Dict[str, Any]:
+    """
+    Generate the corpus (in a temporary directory unless corpus_dir is
+    given), run every stage and return the results dict.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = corpus_dir or tmp
+        files = generate_corpus(root, config)
+        parsed = parse_path(root, jobs=jobs)
+        functions = [fn for f in parsed for fn in f["functions"]]
+        sources = _read_sources(files)
+        # formatting reads annotations; render them once so every timed run does the same work
+        _format_all(functions)
+
+        stages = {
+            "parse_path": lambda: parse_path(root, jobs=jobs),
+            "parse_path_coverage_only": lambda: parse_path(root, jobs=jobs, coverage_only=True),
+            "compute_coverage": lambda: compute_coverage(parsed),
+            "validate_docstrings": lambda: [validate_docstrings(path) for path in files],
+            "compute_complexity": lambda: [compute_complexity(source) for source in sources],
+            "format_docstrings": lambda: _format_all(functions),
+        }
+        results = {name: _measure(stage, repeat) for name, stage in stages.items()}
+        records = bench_records.run(root)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "jobs": jobs,
+        "corpus": {
+            **config.to_dict(),
+            "total_files": len(parsed),
+            "total_functions": len(functions),
+            "total_bytes": sum(len(s.encode("utf-8")) for s in sources),
+        },
+        "stages": results,
+        "records_memory": records,
+    }
+
+
+def main(argv: List[str] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    add_config_args(parser)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage")
+    parser.add_argument("--jobs", type=int, default=1, help="Parallel parser processes for parse_path")
+    parser.add_argument("--corpus-dir", type=str, default=None, help="Keep the generated corpus here")
+    parser.add_argument("--out", type=str, default=None, help="Results JSON (default: storage/benchmarks/<time>.json)")
+    args = parser.parse_args(argv)
+
+    result = run(config_from_args(args), repeat=args.repeat, jobs=args.jobs, corpus_dir=args.corpus_dir)
+    out = args.out or os.path.join(
+        DEFAULT_RESULTS_DIR, f"bench-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    out_dir = os.path.dirname(out)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(result, fh, indent=2)
+
+    for name, stage in result["stages"].items():
+        print(f"{name:<26} {stage['seconds_min']:>10.4f}s  peak {stage['peak_memory_bytes'] / 1e6:>8.2f} MB")
+    print(f"Results written to {out}", file=sys.stderr)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,113 @@
 """
 Simple CLI to run Milestone 1 scan from terminal.
 Usage:
-    python -m cli.commands scan <path> [--out storage/review_logs.json] [--generate-docs]
+    python -m cli.commands scan <path> [--out storage/review_logs.json] [--generate-docs] [--concurrency N] [--batch] [--jobs N] [--no-cache] [--coverage-only] [--metrics-out storage/llm_metrics]
 """
 
 import argparse
 import json
 import os
-from core.parser.python_parser import parse_path
-from core.docstring_engine.generator import generate_google_docstring
-from core.reporter.coverage_reporter import compute_coverage, write_report
+from contextlib import nullcontext
+from core.parser.python_parser import iter_parse_path
+from core.parser.cache import ParseCache
+from core.docstring_engine.generator import generate_docstrings
+from core.docstring_engine.heuristics import default_synthesizer
+from core.docstring_engine.llm_integration import MAX_BATCH_SIZE
+from core.docstring_engine.metrics import default_metrics
+from core.docstring_engine.rate_limit import default_rate_limiter
+from core.docstring_engine.routing import default_router
+from core.docstring_engine.scheduler import default_scheduler
+from core.reporter.coverage_reporter import write_report_streaming
 
+_QUEUED_PER_REQUEST = 4
 
-def _attach_generated_docstrings(results, generate_docs: bool = False):
+
+def _attach_generated_docstrings(results, generate_docs: bool = False, max_concurrency: int = 8, batched: bool = False):
     if not generate_docs:
         return results
+    return _with_generated_docstrings(results, max_concurrency, batched)
+
+
+def _with_generated_docstrings(results, max_concurrency, batched):
+    # files are held back until enough undocumented functions are queued to
+    # keep max_concurrency requests busy, then released in scan order
+    queue_size = max_concurrency * (MAX_BATCH_SIZE if batched else _QUEUED_PER_REQUEST)
+    files, pending = [], []
     for f in results:
-        for fn in f.get("functions", []):
-            if not fn.get("has_docstring"):
-                fn["generated_docstring"] = generate_google_docstring(fn)
-    return results
+        files.append(f)
+        pending.extend(fn for fn in f.get("functions", []) if not fn.get("has_docstring"))
+        if len(pending) >= queue_size:
+            _generate(pending, max_concurrency, batched)
+            yield from files
+            files, pending = [], []
+    _generate(pending, max_concurrency, batched)
+    yield from files
+
+
+def _generate(functions, max_concurrency, batched):
+    if not functions:
+        return
+    for fn, doc in zip(functions, generate_docstrings(functions, "google", max_concurrency, batched=batched)):
+        if isinstance(doc, Exception):
+            fn["generation_error"] = str(doc)
+        else:
+            fn["generated_docstring"] = doc
 
 
 def cmd_scan(args):
     path = args.path
-    results = parse_path(path)
-    results = _attach_generated_docstrings(results, args.generate_docs)
-    report = compute_coverage(results)
     out = args.out
     out_dir = os.path.dirname(out)
     if out_dir and not os.path.exists(out_dir):
         os.makedirs(out_dir, exist_ok=True)
-    write_report(report, out)
-    print(f"Scanned {len(results)} files — aggregate coverage: {report['aggregate']['coverage_percent']}%")
+    # files stream from the parser straight into the report file
+    namespace = "coverage" if args.coverage_only else "parse"
+    with (nullcontext() if args.no_cache else ParseCache(namespace=namespace)) as cache:
+        results = iter_parse_path(path, jobs=args.jobs, cache=cache, coverage_only=args.coverage_only)
+        results = _attach_generated_docstrings(results, args.generate_docs, args.concurrency, args.batch)
+        aggregate = write_report_streaming(results, out)
+    print(f"Scanned {aggregate['total_files']} files — aggregate coverage: {aggregate['coverage_percent']}%")
     print(f"Report written to {out}")
+    if args.generate_docs:
+        limits = default_rate_limiter().stats()
+        print(
+            f"LLM requests: {limits['requests']} ({limits['retries']} retries), "
+            f"rate-limit wait: {limits['wait_seconds_total']}s"
+        )
+        heuristics = default_synthesizer().stats()
+        print(f"LLM calls avoided by heuristics: {heuristics['avoided_llm_calls']}")
+        dedup = default_scheduler().stats()
+        print(
+            f"Functions sharing a request: {dedup['deduplicated']} of {dedup['functions']} "
+            f"(dedup ratio {dedup['dedup_ratio']:.1%})"
+        )
+        for model, usage in default_router().stats().items():
+            print(
+                f"  {model}: {usage['requests']} requests for {usage['functions']} functions, "
+                f"mean latency {usage['mean_latency_seconds']}s, "
+                f"tokens {usage['prompt_tokens']} in / {usage['completion_tokens']} out"
+            )
+        _print_metrics(args.metrics_out)
+
+
+def _print_metrics(prefix):
+    metrics = default_metrics()
+    summary = metrics.summary()
+    latency = summary["latency_seconds"]
+    print(
+        f"LLM calls: {summary['calls']} ({summary['errors']} failed, {summary['retries']} retries), "
+        f"latency p50/p95/p99: {latency['p50']}s / {latency['p95']}s / {latency['p99']}s"
+    )
+    print(
+        f"Tokens: {summary['prompt_tokens']} prompt / {summary['completion_tokens']} completion, "
+        f"fallback rate: {summary['fallback_rate']:.1%}, cache hit rate: {summary['cache_hit_rate']:.1%}"
+    )
+    parsing = summary["json"]
+    print(
+        f"Responses: {parsing['clean']} clean JSON, {parsing['salvaged']} repaired, "
+        f"{parsing['failed']} unusable (salvage rate {parsing['salvage_rate']:.1%})"
+    )
+    print(f"Metrics written to {metrics.export_json(prefix + '.json')} and {metrics.export_csv(prefix + '.csv')}")
 
 
 def main():
@@ -43,7 +117,32 @@ def main():
     scan.add_argument("path", type=str, help="Path to file or directory to scan")
     scan.add_argument("--out", type=str, default="storage/review_logs.json", help="Output JSON path")
     scan.add_argument("--generate-docs", action="store_true", default=False)
+    scan.add_argument("--jobs", type=int, default=1, help="Parallel parser processes (0 = all cores)")
+    scan.add_argument("--no-cache", action="store_true", default=False, help="Ignore the persistent parse cache")
+    scan.add_argument(
+        "--concurrency", type=int, default=8, help="LLM requests in flight with --generate-docs"
+    )
+    scan.add_argument(
+        "--batch",
+        action="store_true",
+        default=False,
+        help="Pack several functions into each LLM request with --generate-docs",
+    )
+    scan.add_argument(
+        "--coverage-only",
+        action="store_true",
+        default=False,
+        help="Only detect docstrings (fast scan for coverage gates)",
+    )
+    scan.add_argument(
+        "--metrics-out",
+        type=str,
+        default="storage/llm_metrics",
+        help="LLM call metrics are written to <prefix>.json and <prefix>.csv with --generate-docs",
+    )
     args = parser.parse_args()
+    if args.command == "scan" and args.coverage_only and args.generate_docs:
+        parser.error("--generate-docs needs a full scan; drop --coverage-only")
     if args.command == "scan":
         cmd_scan(args)
     else:
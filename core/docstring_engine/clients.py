@@ -0,0 +1,88 @@
+"""
+core.docstring_engine.clients
+
+Process-wide registry of chat model clients.
+
+Building a ChatGroq also builds its HTTP client, so constructing one per
+request pays connection and TLS setup every time. The registry builds one
+client per (provider, model, temperature) and hands the same instance to
+every caller and thread, so HTTP connections stay alive between requests
+(and a local model is loaded only once).
+
+A client is anything with invoke(messages) / async ainvoke(messages)
+returning a message with .content, like LangChain chat models. Providers:
+    groq      ChatGroq (GROQ_API_KEY)
+    llamacpp  core.docstring_engine.local_llm.LlamaCppPool (model = .gguf path)
+    replay    core.docstring_engine.journal.ReplayClient (journal from LLM_JOURNAL_PATH)
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+from langchain_groq import ChatGroq
+
+from core.docstring_engine.defaults import process_default
+from core.docstring_engine.journal import replay_client
+from core.docstring_engine.local_llm import llamacpp_client
+
+
+def _groq_client(model: str, temperature: float) -> Any:
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise RuntimeError("GROQ_API_KEY not set")
+    # retries are handled by rate_limit.invoke_with_retry, which honors Retry-After
+    return ChatGroq(model=model, temperature=temperature, api_key=api_key, max_retries=0)
+
+
+# provider name -> factory(model, temperature)
+_FACTORIES: Dict[str, Callable[[str, float], Any]] = {
+    "groq": _groq_client,
+    "llamacpp": llamacpp_client,
+    "replay": replay_client,
+}
+
+
+class ClientRegistry:
+    """
+    Thread-safe map of (provider, model, temperature) to a shared client.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str, float], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: str, temperature: float) -> Any:
+        """
+        Return the client for these settings, creating it on first use.
+
+        Raises ValueError for an unknown provider and RuntimeError when its
+        API key is not configured.
+        """
+        key = (provider, model, temperature)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        if provider not in _FACTORIES:
+            raise ValueError(f"Unknown provider: {provider}")
+        with self._lock:
+            # another thread may have built it while we waited
+            client = self._clients.get(key)
+            if client is None:
+                client = _FACTORIES[provider](model, temperature)
+                self._clients[key] = client
+        return client
+
+    def clear(self) -> None:
+        """Drop every client (e.g. after the API key changed)."""
+        with self._lock:
+            self._clients.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+@process_default
+def default_client_registry() -> ClientRegistry:
+    """The registry used when callers do not pass their own."""
+    return ClientRegistry()
@@ -0,0 +1,61 @@
+"""
+core.docstring_engine.defaults
+
+Process-wide default instances (client registry, rate limiter, response
+cache, metrics, ...).
+
+A module declares one by decorating a zero-argument factory with
+@process_default; calling the result builds the instance on first use and
+returns the same one afterwards. set() swaps in another instance and
+reset() drops it so the next call builds a fresh one; reset_all() does that
+for every default (e.g. between tests).
+"""
+
+import functools
+import threading
+from typing import Callable, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_registered: List["ProcessDefault"] = []
+
+
+class ProcessDefault(Generic[T]):
+    """
+    Lazily built instance shared by the whole process. Thread-safe.
+
+    A factory that returns None (e.g. a feature switched off) is asked
+    again on the next call.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+        functools.update_wrapper(self, factory)
+        _registered.append(self)
+
+    def __call__(self) -> T:
+        with self._lock:
+            if self._instance is None:
+                self._instance = self._factory()
+            return self._instance
+
+    def set(self, instance: Optional[T]) -> None:
+        """Use instance from now on (None: build a new one on next use)."""
+        with self._lock:
+            self._instance = instance
+
+    def reset(self) -> None:
+        self.set(None)
+
+
+def process_default(factory: Callable[[], T]) -> ProcessDefault[T]:
+    """Decorator turning factory into a ProcessDefault."""
+    return ProcessDefault(factory)
+
+
+def reset_all() -> None:
+    """Drop every default instance; each is rebuilt on next use."""
+    for default in list(_registered):
+        default.reset()
@@ -7,8 +7,22 @@ Generates style-consistent docstrings using:
 - Deterministic formatters for structure
 """
 
-from typing import Dict, List, Optional
-from core.docstring_engine.llm_integration import generate_docstring_content
+import asyncio
+import queue
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, MutableMapping, Optional, Tuple, Union
+
+from core.docstring_engine.clients import ClientRegistry
+from core.docstring_engine.heuristics import default_synthesizer
+from core.docstring_engine.llm_integration import (
+    agenerate_docstring_content,
+    agenerate_docstring_contents,
+    content_key,
+    generate_docstring_content,
+    is_fallback,
+)
+from core.docstring_engine.scheduler import default_scheduler
 
 
 # -------------------------------------------------
@@ -132,20 +146,310 @@ def generate_rest_docstring(fn: Dict, llm: Dict) -> str:
 # -------------------------------------------------
 # Main entry
 # -------------------------------------------------
-def generate_docstring(fn: Dict, style: str = "google") -> str:
+_FORMATTERS = {
+    "google": generate_google_docstring,
+    "numpy": generate_numpy_docstring,
+    "rest": generate_rest_docstring,
+}
+
+
+def _formatter(style: str):
+    try:
+        return _FORMATTERS[style]
+    except KeyError:
+        raise ValueError(f"Unknown style: {style}") from None
+
+
+def format_docstring(fn: Dict, content: Dict, style: str = "google") -> str:
+    """
+    Render already generated LLM content in the given style (no LLM call).
+    """
+    return _formatter(style)(fn, content)
+
+
+# -------------------------------------------------
+# Content memo
+# -------------------------------------------------
+# LLM content (summary, args, returns, raises) does not depend on the style,
+# so it is kept per function and switching styles only re-runs the formatters.
+_MEMO_SIZE = 4096
+_memo: "OrderedDict[str, Dict]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _memo_get(key: str) -> Optional[Dict]:
+    with _memo_lock:
+        content = _memo.get(key)
+        if content is not None:
+            _memo.move_to_end(key)
+        return content
+
+
+def clear_memo() -> None:
+    """Forget the content generated so far in this process."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def _memo_put(key: str, content: Dict) -> None:
+    with _memo_lock:
+        _memo[key] = content
+        _memo.move_to_end(key)
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def _known_content(fn: Dict, key: str, memo: Optional[MutableMapping[str, Dict]] = None, count: bool = True) -> Optional[Dict]:
+    # heuristics first: they read the body, which content_key leaves out, so
+    # synthesized content is never memoized and memoized content is LLM-only
+    content = default_synthesizer().content(fn, count)
+    if content is None and memo is not None:
+        content = memo.get(key)
+    if content is None:
+        content = _memo_get(key)
+    return content
+
+
+def generate_docstring(fn: Dict, style: str = "google", clients: Optional[ClientRegistry] = None) -> str:
     """
     Generate docstring using:
     - LLM for meaning
     - Code for formatting
+
+    clients: registry to take the chat client from (default: process-wide).
+    """
+
+    formatter = _formatter(style)
+    key = content_key(fn)
+    llm_content = _known_content(fn, key)
+    if llm_content is None:
+        llm_content = generate_docstring_content(fn, clients=clients)
+        if not is_fallback(llm_content):
+            _memo_put(key, llm_content)
+    return formatter(fn, llm_content)
+
+
+async def generate_contents_async(
+    functions: Iterable[Dict],
+    max_concurrency: int = 8,
+    clients: Optional[ClientRegistry] = None,
+    batched: bool = False,
+    on_content: Optional[Callable[[int, Union[Dict, Exception]], None]] = None,
+    on_text: Optional[Callable[[int, str], None]] = None,
+    memo: Optional[MutableMapping[str, Dict]] = None,
+) -> List[Union[Dict, Exception]]:
+    """
+    Style-independent LLM content for many functions, in input order.
+
+    Trivial functions are described by heuristics.default_synthesizer().
+    Otherwise memo, an extra content store (e.g. a UI session's cache), is
+    checked and filled with every generated result, and content already
+    generated in this process is reused. The rest is grouped by content_key
+    (scheduler.default_scheduler()): content is requested once per group of
+    functions with identical prompts, with up to max_concurrency requests in
+    flight (batched=True packs several functions into each request, see
+    llm_integration.agenerate_docstring_contents), and shared by every
+    member. A function whose generation fails gets its
+    exception in place of content.
+
+    on_content(index, content) is called as soon as each function's content
+    (or exception) is known. on_text(index, text) streams the raw response
+    text received so far (not in batched mode).
+    """
+    functions = list(functions)
+    keys = [content_key(fn) for fn in functions]
+    contents: List[Union[Dict, Exception, None]] = [None] * len(functions)
+
+    def settle(i: int, content: Union[Dict, Exception], remember: bool = True) -> None:
+        contents[i] = content
+        if remember and memo is not None and not isinstance(content, Exception):
+            memo[keys[i]] = content
+        if on_content is not None:
+            on_content(i, content)
+
+    for i, fn in enumerate(functions):
+        content = _known_content(fn, keys[i], memo)
+        if content is not None:
+            # synthesized content stays out of memo (see _known_content)
+            settle(i, content, remember=False)
+    missing = [i for i, content in enumerate(contents) if content is None]
+    if not missing:
+        return contents
+
+    scheduler = default_scheduler()
+
+    def share(group: List[int], content: Union[Dict, Exception]) -> None:
+        # failures and fallback placeholders are not remembered, so they are requested again
+        remember = not isinstance(content, Exception) and not is_fallback(content)
+        for i in group:
+            if remember:
+                _memo_put(keys[i], content)
+            settle(i, content, remember)
+
+    groups = [[missing[j] for j in group] for group in scheduler.group([functions[i] for i in missing])]
+    if batched:
+        todo = [functions[group[0]] for group in groups]
+        fetched = await agenerate_docstring_contents(todo, clients=clients, max_concurrency=max_concurrency)
+        for group, content in zip(groups, fetched):
+            share(group, content)
+        return contents
+
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def one(group: List[int]) -> None:
+        def stream(text: str) -> None:
+            for i in group:
+                on_text(i, text)
+
+        async with semaphore:
+            try:
+                content = await agenerate_docstring_content(
+                    functions[group[0]], clients=clients, on_text=stream if on_text is not None else None
+                )
+            except Exception as e:
+                content = e
+        share(group, content)
+
+    await asyncio.gather(*(one(group) for group in groups))
+    return contents
+
+
+def _format_all(functions: List[Dict], contents: List[Union[Dict, Exception]], style: str) -> List[Union[str, Exception]]:
+    formatter = _formatter(style)
+    docs: List[Union[str, Exception]] = []
+    for fn, content in zip(functions, contents):
+        if isinstance(content, Exception):
+            docs.append(content)
+            continue
+        try:
+            docs.append(formatter(fn, content))
+        except Exception as e:
+            docs.append(e)
+    return docs
+
+
+async def generate_docstrings_async(
+    functions: Iterable[Dict],
+    style: str = "google",
+    max_concurrency: int = 8,
+    clients: Optional[ClientRegistry] = None,
+    batched: bool = False,
+) -> List[Union[str, Exception]]:
     """
+    Generate docstrings for many functions with up to max_concurrency LLM
+    requests in flight.
 
-    llm_content = generate_docstring_content(fn)
+    batched=True packs several functions into each request (see
+    llm_integration.agenerate_docstring_contents), which cuts requests and
+    prompt tokens on large backfills.
 
-    if style == "google":
-        return generate_google_docstring(fn, llm_content)
-    elif style == "numpy":
-        return generate_numpy_docstring(fn, llm_content)
-    elif style == "rest":
-        return generate_rest_docstring(fn, llm_content)
-    else:
-        raise ValueError(f"Unknown style: {style}")
+    Results are in input order. A function whose generation fails gets its
+    exception in place of a docstring; the others are unaffected.
+    """
+    _formatter(style)
+    functions = list(functions)
+    contents = await generate_contents_async(functions, max_concurrency, clients, batched)
+    return _format_all(functions, contents, style)
+
+
+def generate_docstrings(
+    functions: Iterable[Dict],
+    style: str = "google",
+    max_concurrency: int = 8,
+    clients: Optional[ClientRegistry] = None,
+    batched: bool = False,
+) -> List[Union[str, Exception]]:
+    """
+    Blocking wrapper around generate_docstrings_async for synchronous callers.
+
+    Runs on one long-lived event loop so the pooled async HTTP clients,
+    which belong to the loop they were first used on, stay usable across
+    calls (CLI batches, Streamlit reruns).
+    """
+    functions = list(functions)
+    contents = [_known_content(fn, content_key(fn), count=False) for fn in functions]
+    if all(content is not None for content in contents):
+        # e.g. a style switch: only the formatters run, no event loop round-trip
+        return _format_all(functions, contents, style)
+    coro = generate_docstrings_async(functions, style, max_concurrency, clients, batched)
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def generate_contents(
+    functions: Iterable[Dict],
+    max_concurrency: int = 8,
+    clients: Optional[ClientRegistry] = None,
+    memo: Optional[MutableMapping[str, Dict]] = None,
+) -> List[Union[Dict, Exception]]:
+    """Blocking wrapper around generate_contents_async (on the shared background loop)."""
+    coro = generate_contents_async(functions, max_concurrency, clients, memo=memo)
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def stream_docstrings(
+    functions: Iterable[Dict],
+    style: str = "google",
+    max_concurrency: int = 8,
+    clients: Optional[ClientRegistry] = None,
+    idle_seconds: float = 0.1,
+    memo: Optional[MutableMapping[str, Dict]] = None,
+) -> Iterator[Tuple[str, int, Any]]:
+    """
+    Generate docstrings in the background and yield events as they happen:
+
+    - ("text", index, raw response text so far) while content streams in
+    - ("done", index, docstring or exception) once per function
+    - ("idle", -1, None) after idle_seconds without news, so UI code gets
+      a chance to notice it was interrupted
+
+    Memoized and synthesized functions are done immediately (memo as in
+    generate_contents_async). Closing the
+    iterator (e.g. ``with contextlib.closing(...)``) cancels the requests
+    still in flight.
+    """
+    formatter = _formatter(style)
+    functions = list(functions)
+    events: "queue.Queue[Tuple[str, int, Any]]" = queue.Queue()
+
+    def on_content(i: int, content: Union[Dict, Exception]) -> None:
+        if not isinstance(content, Exception):
+            try:
+                content = formatter(functions[i], content)
+            except Exception as e:
+                content = e
+        events.put(("done", i, content))
+
+    def on_text(i: int, text: str) -> None:
+        events.put(("text", i, text))
+
+    coro = generate_contents_async(functions, max_concurrency, clients, False, on_content, on_text, memo)
+    future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
+    remaining = len(functions)
+    try:
+        while remaining:
+            try:
+                event = events.get(timeout=idle_seconds)
+            except queue.Empty:
+                if future.done():
+                    # failed outside the per-function error handling
+                    future.result()
+                yield ("idle", -1, None)
+                continue
+            if event[0] == "done":
+                remaining -= 1
+            yield event
+    finally:
+        future.cancel()
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="docstring-generation", daemon=True).start()
+        return _loop
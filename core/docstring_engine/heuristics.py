@@ -0,0 +1,147 @@
+"""
+core.docstring_engine.heuristics
+
+Rule-based docstring content for trivial functions.
+
+Field-assigning ``__init__`` methods, property getters and setters,
+``__repr__`` / ``__str__`` and one-line delegators are described from the
+parser's body_shape, complexity and signature alone. Each rule reports a
+confidence; content below the threshold is discarded and the function goes
+to the LLM as usual. The synthesizer counts the LLM calls it avoided.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from core.docstring_engine.defaults import process_default
+
+DEFAULT_THRESHOLD = float(os.getenv("DOCSTRING_HEURISTIC_THRESHOLD", "0.8"))
+
+_SELF_ARGS = {"self": "The instance.", "cls": "The class."}
+
+
+def _words(name: str) -> str:
+    return name.strip("_").replace("_", " ") or name
+
+
+def _arg_names(fn: Dict[str, Any]):
+    return [a["name"] for a in fn.get("args", [])]
+
+
+def _describe_args(fn: Dict[str, Any], known: Dict[str, str]) -> Tuple[Dict[str, str], bool]:
+    # returns the descriptions and whether every argument got one
+    descriptions, complete = {}, True
+    for name in _arg_names(fn):
+        if name in _SELF_ARGS:
+            descriptions[name] = _SELF_ARGS[name]
+        elif name in known:
+            descriptions[name] = known[name]
+        else:
+            complete = False
+    return descriptions, complete
+
+
+def _decorated(fn: Dict[str, Any], suffix: str) -> bool:
+    return any(str(d).endswith(suffix) for d in fn.get("decorators") or [])
+
+
+def _content(summary: str, args: Dict[str, str], returns: str = "") -> Dict[str, Any]:
+    return {"summary": summary, "args": args, "returns": returns, "raises": {}}
+
+
+def synthesize_content(fn: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], float]:
+    """
+    Return (content, confidence) for a trivial function, or (None, 0.0)
+    when no rule applies. Content has the same keys as the LLM output.
+    """
+    shape = fn.get("body_shape")
+    if not shape or fn.get("complexity", 1) != 1 or fn.get("raises") or fn.get("yields"):
+        return None, 0.0
+    name = fn.get("name", "")
+    kind = shape["kind"]
+
+    if name in ("__repr__", "__str__") and kind in ("return_value", "delegate"):
+        args, _ = _describe_args(fn, {})
+        if name == "__repr__":
+            return _content("Return the developer representation of the instance.", args, "Representation string."), 0.9
+        return _content("Return the readable string form of the instance.", args, "Readable string."), 0.9
+
+    if kind == "assign_fields":
+        known = {arg: f"Value stored as ``{attr}``." for attr, arg in shape["fields"] if arg}
+        args, complete = _describe_args(fn, known)
+        if name == "__init__":
+            confidence = 0.95 if complete else 0.6
+            return _content("Initialize the instance.", args, ""), confidence
+        if _decorated(fn, ".setter") and len(shape["fields"]) == 1:
+            attr = shape["fields"][0][0]
+            args, complete = _describe_args(fn, {arg: f"New {_words(attr)}." for arg in known})
+            return _content(f"Set the {_words(attr)}.", args, ""), 0.9 if complete else 0.6
+        if name.startswith("set_") and len(shape["fields"]) == 1:
+            return _content(f"Set the {_words(shape['fields'][0][0])}.", args, ""), 0.85 if complete else 0.6
+        return None, 0.0
+
+    if kind == "return_attr":
+        attr = _words(shape["attr"])
+        args, complete = _describe_args(fn, {})
+        if _decorated(fn, "property"):
+            return _content(f"Return the {attr}.", args, f"The {attr}."), 0.9
+        if name.startswith("get_") or _words(name) == attr:
+            return _content(f"Return the {attr}.", args, f"The {attr}."), 0.85 if complete else 0.5
+        return _content(f"Return the {attr}.", args, f"The {attr}."), 0.7
+
+    if kind == "delegate":
+        target = shape["target"]
+        passes = set(shape["passes"])
+        known = {arg: f"Passed to ``{target}``." for arg in passes}
+        args, complete = _describe_args(fn, known)
+        returns = "" if fn.get("returns") == "None" else f"The result of ``{target}``."
+        return _content(f"Call ``{target}`` with the given arguments.", args, returns), 0.8 if complete else 0.5
+
+    # stubs ("empty") and other expressions: the intent is not visible in the code
+    return None, 0.0
+
+
+class HeuristicSynthesizer:
+    """
+    Applies synthesize_content with a confidence threshold and counts how
+    many LLM calls it avoided. Thread-safe.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.avoided = 0
+        self.fell_through = 0
+        self._lock = threading.Lock()
+
+    def content(self, fn: Dict[str, Any], count: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Content for fn if a rule is confident enough, else None (use the LLM).
+        count=False leaves stats() alone (for lookups that make no request).
+        """
+        content, confidence = synthesize_content(fn)
+        hit = content is not None and confidence >= self.threshold
+        if not count:
+            return content if hit else None
+        with self._lock:
+            if hit:
+                self.avoided += 1
+            else:
+                self.fell_through += 1
+        return content if hit else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.avoided + self.fell_through
+            return {
+                "threshold": self.threshold,
+                "avoided_llm_calls": self.avoided,
+                "fell_through": self.fell_through,
+                "avoided_ratio": round(self.avoided / total, 4) if total else 0.0,
+            }
+
+
+@process_default
+def default_synthesizer() -> HeuristicSynthesizer:
+    """Process-wide synthesizer (threshold from DOCSTRING_HEURISTIC_THRESHOLD, default 0.8)."""
+    return HeuristicSynthesizer()
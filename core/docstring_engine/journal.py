@@ -0,0 +1,108 @@
+"""
+core.docstring_engine.journal
+
+Record / replay journal of LLM requests.
+
+With LLM_JOURNAL=1 every docstring request appends one JSON line to
+LLM_JOURNAL_PATH (default: requests.jsonl at the repo root) with the prompt
+hash, model, latency, token counts, the raw response and how it parsed.
+
+The "replay" provider (LLM_PROVIDER=replay) answers from such a journal
+instead of a model: a prompt is looked up by its hash and gets the recorded
+response. Generation then runs offline, deterministically and without
+network or rate limits, which is what benchmarks and regression tests need.
+Replay never reads or writes the LLM response cache, so every response
+comes from the journal.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from langchain_core.messages import AIMessage
+
+from core.docstring_engine.defaults import process_default
+from core.docstring_engine.messages import prompt_text
+
+DEFAULT_JOURNAL_PATH = "requests.jsonl"
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class RequestJournal:
+    """
+    Append-only JSONL file of request records. Thread-safe.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps({"ts": round(time.time(), 3), **entry}, ensure_ascii=False)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Recorded entries in order; blank or truncated lines are skipped."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+
+class ReplayClient:
+    """
+    Chat-client stand-in that returns the journaled response for a prompt.
+
+    When a prompt was recorded more than once the latest response wins.
+    Unknown prompts raise LookupError.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        self.path = path
+        self._responses: Dict[str, str] = {}
+        for entry in RequestJournal(path).entries():
+            if entry.get("prompt_hash") and entry.get("raw_response") is not None:
+                self._responses[entry["prompt_hash"]] = entry["raw_response"]
+
+    def invoke(self, messages: Any) -> AIMessage:
+        key = prompt_hash(prompt_text(messages))
+        try:
+            return AIMessage(content=self._responses[key])
+        except KeyError:
+            raise LookupError(f"No journaled response for prompt {key[:12]} in {self.path}") from None
+
+    async def ainvoke(self, messages: Any) -> AIMessage:
+        return self.invoke(messages)
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+
+def replay_client(model: str, temperature: float) -> ReplayClient:
+    """ClientRegistry factory replaying LLM_JOURNAL_PATH; model is only a label."""
+    return ReplayClient(os.getenv("LLM_JOURNAL_PATH", DEFAULT_JOURNAL_PATH))
+
+
+@process_default
+def default_journal() -> Optional[RequestJournal]:
+    """The journal requests are recorded to, or None when LLM_JOURNAL is off."""
+    if os.getenv("LLM_JOURNAL", "").lower() not in ("1", "true", "yes", "on"):
+        return None
+    return RequestJournal(os.getenv("LLM_JOURNAL_PATH", DEFAULT_JOURNAL_PATH))
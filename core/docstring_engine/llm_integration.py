@@ -8,19 +8,380 @@ Responsibilities:
 - Never format docstrings
 """
 
-import os
+import asyncio
 import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
+
+from core.docstring_engine.clients import ClientRegistry, default_client_registry
+from core.docstring_engine.journal import default_journal, prompt_hash
+from core.docstring_engine.metrics import default_metrics
+from core.docstring_engine.rate_limit import RateLimiter, ainvoke_with_retry, default_rate_limiter, invoke_with_retry
+from core.docstring_engine.response_cache import LLMResponseCache, default_response_cache, response_key
+from core.docstring_engine.routing import default_router
 
 load_dotenv()
 
+# provider: "groq" (default), "llamacpp" for a local GGUF model on CPU, or
+# "replay" to answer from a recorded request journal (see journal.py)
+PROVIDER = os.getenv("LLM_PROVIDER", "groq")
+_DEFAULT_MODELS = {
+    "groq": "llama-3.1-8b-instant",  # openai/gpt-oss-120b, llama-3.1-8b-instant
+    "llamacpp": os.getenv("LLAMACPP_MODEL_PATH", ""),
+    # a label only: the journal comes from LLM_JOURNAL_PATH
+    "replay": "replay",
+}
+MODEL = os.getenv("LLM_MODEL") or _DEFAULT_MODELS.get(PROVIDER, "")
+# complex functions go to this model instead (routing.py); empty = always MODEL
+_DEFAULT_LARGE_MODELS = {"groq": "openai/gpt-oss-120b"}
+LARGE_MODEL = os.getenv("LLM_LARGE_MODEL", _DEFAULT_LARGE_MODELS.get(PROVIDER, ""))
+TEMPERATURE = 0.3
+# bump whenever the prompt text changes so cached responses are not reused
+PROMPT_VERSION = "1"
+
+# batched prompts: total (prompt + expected completion) tokens per request
+DEFAULT_BATCH_TOKEN_BUDGET = 6000
+MAX_BATCH_SIZE = 25
+# rough ratio for English text and code; only used to size batches
+_CHARS_PER_TOKEN = 4
+# typical completion size of one function's content in a batch response
+_OUTPUT_TOKENS_PER_ITEM = 120
+# extra requests when a single-function response cannot be repaired
+_PARSE_RETRIES = 1
+
+
+def _prompt_inputs(fn: dict) -> dict:
+    return {
+        "name": fn["name"],
+        "args": [a["name"] for a in fn.get("args", [])],
+        "returns": fn.get("returns"),
+        # the parser collects raises from a set; sort so the same function hits the cache
+        "raises": sorted(fn.get("raises", []) or []),
+    }
+
+
+_RULES = """Rules:
+- The summary MUST be written in imperative mood
+- Start with the base verb (e.g., Add, Calculate, Normalize, Convert, Fetch, Validate)
+- Must and should End with a period.
+- Do NOT use third-person verbs (no Adds, Calculates, Returns)
+- If the summary violates this rule, rewrite it internally before responding
+- Include "raises" ONLY if exceptions actually occur
+- If no exceptions occur, return "raises": {}
+- Do NOT invent exceptions
+- Do NOT include markdown
+- Do NOT include triple quotes
+- JSON must be strictly valid
+- Be concise and professional
+"""
+
+_CONTENT_FORMAT = """{
+  "summary": "1–2 line description of what the function does",
+  "args": {
+    "arg_name": "description"
+  },
+  "returns": "description of the return value",
+  "raises": {
+    "ExceptionName": "reason"
+  }
+}"""
+
+
+def _signature_block(inputs: dict) -> str:
+    return (
+        f"Function name: {inputs['name']}\n"
+        f"Arguments: {inputs['args']}\n"
+        f"Return type: {inputs['returns']}\n"
+        f"Known raises: {inputs['raises']}\n"
+    )
+
+
+def model_for(fn: dict) -> str:
+    """
+    The model that writes fn's content: LARGE_MODEL when the router finds
+    fn complex, MODEL otherwise.
+    """
+    if LARGE_MODEL and LARGE_MODEL != MODEL and default_router().is_complex(fn):
+        return LARGE_MODEL
+    return MODEL
+
+
+def content_key(fn: dict) -> str:
+    """
+    Identity of the content generated for fn: its prompt inputs plus the
+    model settings. Functions with the same key get the same content.
+    """
+    return response_key(_prompt_inputs(fn), model_for(fn), TEMPERATURE, PROMPT_VERSION)
+
+
+def _build_prompt(inputs: dict) -> str:
+    return (
+        f"\nReturn ONLY valid JSON in this exact format:\n\n{_CONTENT_FORMAT}\n\n"
+        f"{_RULES}\n\n{_signature_block(inputs)}"
+    )
+
+
+# local models and replay have no quota; retries are still counted
+_UNLIMITED = RateLimiter(requests_per_minute=None, tokens_per_minute=None)
+
+
+def _limiter() -> RateLimiter:
+    return _UNLIMITED if PROVIDER in ("llamacpp", "replay") else default_rate_limiter()
+
+
+class _NoCache:
+    # stands in for the response cache under replay, which must reproduce the journal exactly
+    def get(self, key: str) -> None:
+        return None
+
+    def put(self, key: str, content: dict) -> None:
+        pass
+
+
+_NO_CACHE = _NoCache()
+
+
+def _response_cache(cache: Optional[LLMResponseCache]) -> Any:
+    if PROVIDER == "replay":
+        return _NO_CACHE
+    return cache if cache is not None else default_response_cache()
+
+
+def _cached(cache: Any, key: str) -> Optional[dict]:
+    # a lookup counted in the metrics (replay does no lookups)
+    if cache is _NO_CACHE:
+        return None
+    cached = cache.get(key)
+    default_metrics().record_cache(cached is not None)
+    return cached
+
+
+def _request_tokens(prompt: str, items: int) -> int:
+    # what the request counts against the tokens-per-minute limit
+    return estimate_tokens(prompt) + items * _OUTPUT_TOKENS_PER_ITEM
+
+
+def _record_request(
+    prompt: str, names: List[str], model: str, started: float, response=None, outcome: str = "ok", error=None
+) -> None:
+    """
+    Add a finished request to the metrics, the router's per-model stats
+    and, if LLM_JOURNAL is on, the journal.
+    """
+    latency = time.perf_counter() - started
+    # providers that report usage (ChatGroq) are exact; others are estimated
+    usage = getattr(response, "usage_metadata", None) or {}
+    raw = getattr(response, "content", None)
+    prompt_tokens = usage.get("input_tokens", estimate_tokens(prompt))
+    completion_tokens = usage.get("output_tokens", estimate_tokens(raw) if raw else 0)
+    outcome = "error" if error is not None else outcome
+    default_metrics().record_call(model, outcome, len(names), latency, prompt_tokens, completion_tokens)
+    default_router().record(model, len(names), latency, prompt_tokens, completion_tokens, failed=error is not None)
+
+    journal = default_journal()
+    if journal is None:
+        return
+    journal.record({
+        "prompt_hash": prompt_hash(prompt),
+        "provider": PROVIDER,
+        "model": model,
+        "temperature": TEMPERATURE,
+        "prompt_version": PROMPT_VERSION,
+        "functions": names,
+        "latency_seconds": round(latency, 4),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "tokens_estimated": not usage,
+        "raw_response": raw,
+        "outcome": outcome,
+        "error": f"{type(error).__name__}: {error}" if error is not None else None,
+    })
+
+
+# -------------------------------------------------
+# Response parsing
+# -------------------------------------------------
+_FENCE = re.compile(r"```[A-Za-z]*\s*\n?(.*?)```", re.S)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_PY_LITERALS = re.compile(r"\b(True|False|None)\b")
+_JSON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def _balanced(text: str, start: int) -> Optional[str]:
+    # the {...} / [...] starting at text[start], skipping brackets inside strings
+    depth, quote, i = 0, None, start
+    while i < len(text):
+        c = text[i]
+        if quote:
+            if c == "\\":
+                i += 1
+            elif c == quote:
+                quote = None
+        elif c in "\"'":
+            quote = c
+        elif c in "{[":
+            depth += 1
+        elif c in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+        i += 1
+    return None
+
+
+def _candidates(text: str) -> Iterator[str]:
+    # code-fenced blocks first, then every object / array in the text, in order
+    for source in [m.group(1) for m in _FENCE.finditer(text)] + [text]:
+        yield source.strip()
+        for opener in re.finditer(r"[{\[]", source):
+            found = _balanced(source, opener.start())
+            if found:
+                yield found
+
+
+def _repair(candidate: str) -> str:
+    """
+    Fix what models commonly get wrong: single-quoted strings, trailing
+    commas and Python's True / False / None. Double-quoted strings are
+    kept as they are.
+    """
+    out, i, n = [], 0, len(candidate)
+    while i < n:
+        c = candidate[i]
+        if c in "\"'":
+            j, chars = i + 1, []
+            while j < n and candidate[j] != c:
+                if candidate[j] == "\\" and j + 1 < n:
+                    # \' is not a JSON escape; other escapes are kept
+                    chars.append("'" if candidate[j + 1] == "'" else candidate[j:j + 2])
+                    j += 2
+                    continue
+                chars.append('\\"' if candidate[j] == '"' else candidate[j])
+                j += 1
+            out.append('"' + "".join(chars) + '"')
+            i = j + 1
+            continue
+        j = i
+        while j < n and candidate[j] not in "\"'":
+            j += 1
+        segment = _TRAILING_COMMA.sub(r"\1", candidate[i:j])
+        out.append(_PY_LITERALS.sub(lambda m: _JSON_LITERALS[m.group(1)], segment))
+        i = j
+    return "".join(out)
+
 
-def generate_docstring_content(fn: dict) -> dict:
+def extract_json(text: str, accept: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, str]:
+    """
+    Find and parse the JSON value in an LLM response.
+
+    Returns (value, how): how is "clean" when the response is plain JSON,
+    "salvaged" when the JSON had to be cut out of prose or code fences or
+    repaired, and (None, "failed") when nothing parses. Every object / array
+    in the text is tried in order; with accept, values it rejects (e.g. a
+    stray [1] in the prose) are skipped.
+    """
+    try:
+        value = json.loads(text)
+        if accept is None or accept(value):
+            return value, "clean"
+    except (TypeError, ValueError):
+        pass
+    for candidate in _candidates(text or ""):
+        for attempt in (candidate, _repair(candidate)):
+            try:
+                # strict=False: raw newlines inside strings are common
+                value = json.loads(attempt, strict=False)
+            except ValueError:
+                continue
+            if accept is None or accept(value):
+                return value, "salvaged"
+    return None, "failed"
+
+
+def _text_map(value: Any) -> Dict[str, str]:
+    if isinstance(value, list):
+        # e.g. "raises": ["ValueError"]
+        return {str(v): "" for v in value}
+    if not isinstance(value, dict):
+        return {}
+    return {str(k): v if isinstance(v, str) else json.dumps(v) for k, v in value.items()}
+
+
+def validate_content(data: Any) -> Optional[dict]:
+    """
+    Coerce parsed JSON to the content schema (summary, args, returns,
+    raises). Returns None when there is no usable summary.
+    """
+    if not isinstance(data, dict):
+        return None
+    summary = data.get("summary")
+    if not isinstance(summary, str) or not summary.strip():
+        return None
+    returns = data.get("returns")
+    return {
+        "summary": summary.strip(),
+        "args": _text_map(data.get("args")),
+        "returns": returns if isinstance(returns, str) else "" if returns is None else json.dumps(returns),
+        "raises": _text_map(data.get("raises")),
+    }
+
+
+def _parse_content(text: str) -> Tuple[Optional[dict], str]:
+    value, how = extract_json(text, lambda v: validate_content(v) is not None)
+    content = validate_content(value)
+    default_metrics().incr(f"json.{how}")
+    return content, how
+
+
+class FallbackContent(dict):
+    """
+    Placeholder content returned when no response could be parsed. It is a
+    plain content dict otherwise, but must never be cached or memoized so
+    the function is requested again next time.
+    """
+
+
+def is_fallback(content: Any) -> bool:
+    return isinstance(content, FallbackContent)
+
+
+def _fallback_content(inputs: dict) -> dict:
+    # 🔒 Safe fallback (single place only)
+    return FallbackContent({
+        "summary": f"Short description of `{inputs['name']}`.",
+        "args": {a: "DESCRIPTION" for a in inputs["args"]},
+        "returns": "DESCRIPTION",
+        "raises": {}
+    })
+
+
+def _outcome(content: Optional[dict], how: str, final: bool) -> str:
+    if content is None:
+        return "fallback" if final else "unparsed"
+    return "ok" if how == "clean" else "salvaged"
+
+
+def generate_docstring_content(
+    fn: dict,
+    cache: Optional[LLMResponseCache] = None,
+    clients: Optional[ClientRegistry] = None,
+) -> dict:
     """
     Generate structured docstring content using LLM.
 
+    Responses are served from cache (default: the shared storage/llm_cache.sqlite)
+    when the same prompt inputs were already sent with the same model settings.
+    The replay provider bypasses the cache so it reproduces the journal exactly.
+    The chat client comes from clients (default: the process-wide registry),
+    so its HTTP connections are reused across calls. The model is chosen
+    per function by model_for. With LLM_JOURNAL on, each request is appended
+    to the request journal (see journal.py).
+
     Returns dict:
     {
         "summary": str,
@@ -28,66 +389,267 @@ def generate_docstring_content(fn: dict) -> dict:
         "returns": str,
         "raises": {ExceptionName: description}
     }
+
+    When no response parses, placeholder content is returned instead
+    (is_fallback() is true for it).
+    """
+
+    cache = _response_cache(cache)
+    inputs = _prompt_inputs(fn)
+    model = model_for(fn)
+    key = response_key(inputs, model, TEMPERATURE, PROMPT_VERSION)
+    cached = _cached(cache, key)
+    if cached is not None:
+        return cached
+
+    llm = (clients if clients is not None else default_client_registry()).get(PROVIDER, model, TEMPERATURE)
+    prompt = _build_prompt(inputs)
+    for attempt in range(_PARSE_RETRIES + 1):
+        started = time.perf_counter()
+        try:
+            response = invoke_with_retry(llm, [HumanMessage(content=prompt)], _request_tokens(prompt, 1), _limiter())
+        except Exception as e:
+            _record_request(prompt, [inputs["name"]], model, started, error=e)
+            raise
+        content, how = _parse_content(response.content)
+        _record_request(prompt, [inputs["name"]], model, started, response, _outcome(content, how, attempt == _PARSE_RETRIES))
+        if content is not None:
+            # only real responses are cached; the fallback should be retried next time
+            cache.put(key, content)
+            return content
+    return _fallback_content(inputs)
+
+
+class _StreamingClient:
+    """
+    Chat client wrapper whose ainvoke streams the response, passing the text
+    received so far to on_text after every chunk. Clients without astream
+    report the whole response at once.
+    """
+
+    def __init__(self, llm: Any, on_text: Callable[[str], None]):
+        self._llm = llm
+        self._on_text = on_text
+
+    async def ainvoke(self, messages: Any) -> Any:
+        if not hasattr(self._llm, "astream"):
+            response = await self._llm.ainvoke(messages)
+            self._on_text(response.content)
+            return response
+        message = None
+        async for chunk in self._llm.astream(messages):
+            # chunks add up to one message, usage metadata included
+            message = chunk if message is None else message + chunk
+            self._on_text(message.content)
+        return message if message is not None else AIMessage(content="")
+
+
+async def agenerate_docstring_content(
+    fn: dict,
+    cache: Optional[LLMResponseCache] = None,
+    clients: Optional[ClientRegistry] = None,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> dict:
     """
+    Async version of generate_docstring_content (uses the client's ainvoke).
+
+    With on_text the response is streamed and on_text gets the raw text
+    received so far after every chunk (not called for cached content).
+    """
+
+    cache = _response_cache(cache)
+    inputs = _prompt_inputs(fn)
+    model = model_for(fn)
+    key = response_key(inputs, model, TEMPERATURE, PROMPT_VERSION)
+    cached = _cached(cache, key)
+    if cached is not None:
+        return cached
+    return await _arequest_content(inputs, model, key, cache, clients, on_text)
+
+
+async def _arequest_content(
+    inputs: dict,
+    model: str,
+    key: str,
+    cache: Any,
+    clients: Optional[ClientRegistry] = None,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> dict:
+    # the request half of agenerate_docstring_content, for callers that already missed the cache
+    llm = (clients if clients is not None else default_client_registry()).get(PROVIDER, model, TEMPERATURE)
+    if on_text is not None:
+        llm = _StreamingClient(llm, on_text)
+    prompt = _build_prompt(inputs)
+    for attempt in range(_PARSE_RETRIES + 1):
+        started = time.perf_counter()
+        try:
+            response = await ainvoke_with_retry(
+                llm, [HumanMessage(content=prompt)], _request_tokens(prompt, 1), _limiter()
+            )
+        except Exception as e:
+            _record_request(prompt, [inputs["name"]], model, started, error=e)
+            raise
+        content, how = _parse_content(response.content)
+        _record_request(prompt, [inputs["name"]], model, started, response, _outcome(content, how, attempt == _PARSE_RETRIES))
+        if content is not None:
+            cache.put(key, content)
+            return content
+    return _fallback_content(inputs)
+
+
+# -------------------------------------------------
+# Batched mode: many functions per request
+# -------------------------------------------------
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used to size batches."""
+    return len(text) // _CHARS_PER_TOKEN + 1
 
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise RuntimeError("GROQ_API_KEY not set")
 
-    llm = ChatGroq(
-        model="llama-3.1-8b-instant", # openai/gpt-oss-120b, llama-3.1-8b-instant
-        temperature=0.3,
-        api_key=api_key
+def _batch_item_block(item_id: str, inputs: dict) -> str:
+    return f"Function id: {item_id}\n{_signature_block(inputs)}\n"
+
+
+def _build_batch_prompt(items: List[Tuple[str, dict]]) -> str:
+    item_format = _CONTENT_FORMAT.replace("{\n", '{\n  "id": "function id",\n', 1)
+    return (
+        "\nReturn ONLY a valid JSON array with one object per function below, "
+        f"each in this exact format:\n\n[\n{item_format}\n]\n\n"
+        f"{_RULES}\n\n"
+        + "".join(_batch_item_block(item_id, inputs) for item_id, inputs in items)
     )
 
-    arg_names = [a["name"] for a in fn.get("args", [])]
-    raises = fn.get("raises", [])
 
-    prompt = f"""
-Return ONLY valid JSON in this exact format:
+def _plan_batches(items: List[Tuple[str, dict]], token_budget: int, max_batch_size: int) -> List[List[Tuple[str, dict]]]:
+    # greedy packing: add functions until the next one would exceed the budget
+    base = estimate_tokens(_build_batch_prompt([]))
+    batches, current, used = [], [], base
+    for item in items:
+        cost = estimate_tokens(_batch_item_block(*item)) + _OUTPUT_TOKENS_PER_ITEM
+        if current and (used + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, used = [], base
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
 
-{{
-  "summary": "1–2 line description of what the function does",
-  "args": {{
-    "arg_name": "description"
-  }},
-  "returns": "description of the return value",
-  "raises": {{
-    "ExceptionName": "reason"
-  }}
-}}
 
-Rules:
-- The summary MUST be written in imperative mood
-- Start with the base verb (e.g., Add, Calculate, Normalize, Convert, Fetch, Validate)
-- Must and should End with a period.
-- Do NOT use third-person verbs (no Adds, Calculates, Returns)
-- If the summary violates this rule, rewrite it internally before responding
-- Include "raises" ONLY if exceptions actually occur
-- If no exceptions occur, return "raises": {{}}
-- Do NOT invent exceptions
-- Do NOT include markdown
-- Do NOT include triple quotes
-- JSON must be strictly valid
-- Be concise and professional
+def _batch_contents(data: Any) -> Dict[str, dict]:
+    # function id -> content for every item that passes validate_content
+    if isinstance(data, dict) and "id" not in data:
+        # tolerate {"<id>": {...}} instead of a list
+        data = [{**item, "id": item_id} for item_id, item in data.items() if isinstance(item, dict)]
+    elif isinstance(data, dict):
+        data = [data]
+    contents = {}
+    for item in data if isinstance(data, list) else []:
+        content = validate_content(item) if isinstance(item, dict) and "id" in item else None
+        if content is not None:
+            contents[str(item["id"])] = content
+    return contents
 
 
-Function name: {fn["name"]}
-Arguments: {arg_names}
-Return type: {fn.get("returns")}
-Known raises: {raises}
-"""
+def _parse_batch_response(text: str) -> Tuple[Dict[str, dict], str]:
+    """
+    Map function id -> content for every item that passes validate_content
+    (anything missing or malformed is simply absent), plus how the JSON
+    was extracted.
+    """
+    data, how = extract_json(text, lambda v: bool(_batch_contents(v)))
+    contents = _batch_contents(data)
+    default_metrics().incr(f"json.{how}")
+    return contents, how
 
-    response = llm.invoke([HumanMessage(content=prompt)])
 
-    try:
-        return json.loads(response.content)
-    except json.JSONDecodeError:
-        # 🔒 Safe fallback (single place only)
-        return {
-            "summary": f"Short description of `{fn['name']}`.",
-            "args": {a: "DESCRIPTION" for a in arg_names},
-            "returns": "DESCRIPTION",
-            "raises": {}
-        }
+async def agenerate_docstring_contents(
+    functions: List[dict],
+    cache: Optional[LLMResponseCache] = None,
+    clients: Optional[ClientRegistry] = None,
+    token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+    max_batch_size: int = MAX_BATCH_SIZE,
+    max_concurrency: int = 4,
+) -> List[Union[dict, Exception]]:
+    """
+    Docstring content for many functions, packing several functions into
+    each request so the rules block is sent once per batch.
+
+    Cached functions are answered from the cache and identical prompt inputs
+    are requested once. Batch size adapts to token_budget (estimated prompt
+    plus completion tokens per request). Items missing or malformed in a
+    batch response are retried one at a time with the single-function
+    prompt. Functions routed to different models (model_for) never share a
+    batch. Results are in input order; an item that still fails gets its
+    exception.
+    """
+    cache = _response_cache(cache)
+    results: List[Union[dict, Exception, None]] = [None] * len(functions)
+
+    # key -> (model, prompt inputs, indexes of functions that share them)
+    misses: Dict[str, Tuple[str, dict, List[int]]] = {}
+    for index, fn in enumerate(functions):
+        inputs = _prompt_inputs(fn)
+        model = model_for(fn)
+        key = response_key(inputs, model, TEMPERATURE, PROMPT_VERSION)
+        if key in misses:
+            misses[key][2].append(index)
+            continue
+        cached = _cached(cache, key)
+        if cached is not None:
+            results[index] = cached
+        else:
+            misses[key] = (model, inputs, [index])
+    if not misses:
+        return results
+
+    registry = clients if clients is not None else default_client_registry()
+    key_of: Dict[str, str] = {}
+    items_by_model: Dict[str, List[Tuple[str, dict]]] = {}
+    for n, (key, (model, inputs, _)) in enumerate(misses.items()):
+        key_of[f"f{n}"] = key
+        items_by_model.setdefault(model, []).append((f"f{n}", inputs))
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def run_batch(model: str, batch: List[Tuple[str, dict]]) -> None:
+        async with semaphore:
+            prompt = _build_batch_prompt(batch)
+            names = [inputs["name"] for _, inputs in batch]
+            started = time.perf_counter()
+            try:
+                response = await ainvoke_with_retry(
+                    registry.get(PROVIDER, model, TEMPERATURE),
+                    [HumanMessage(content=prompt)],
+                    _request_tokens(prompt, len(batch)),
+                    _limiter(),
+                )
+                parsed, how = _parse_batch_response(response.content)
+                if len(parsed) < len(batch):
+                    # the missing items are retried one at a time below
+                    outcome = "partial" if parsed else "unparsed"
+                else:
+                    outcome = "ok" if how == "clean" else "salvaged"
+                _record_request(prompt, names, model, started, response, outcome)
+            except Exception as e:
+                # the whole request failed: fall back to per-item requests
+                _record_request(prompt, names, model, started, error=e)
+                parsed = {}
+            for item_id, _ in batch:
+                key = key_of[item_id]
+                indexes = misses[key][2]
+                content = parsed.get(item_id)
+                if content is not None:
+                    cache.put(key, content)
+                else:
+                    try:
+                        content = await _arequest_content(misses[key][1], model, key, cache, registry)
+                    except Exception as e:
+                        content = e
+                for index in indexes:
+                    results[index] = content
 
+    await asyncio.gather(*(
+        run_batch(model, batch)
+        for model, items in items_by_model.items()
+        for batch in _plan_batches(items, token_budget, max_batch_size)
+    ))
+    return results
@@ -0,0 +1,118 @@
+"""
+core.docstring_engine.local_llm
+
+Local llama.cpp backend (promoted from experiments/llm_local.py).
+
+A LlamaCppPool loads a GGUF model with LlamaCpp and serves requests from a
+small pool of model instances, so a few CPU inferences can run at once. The
+first instance is loaded when the pool is built (the registry keeps the
+pool as a warm, process-wide singleton); more are loaded only when
+concurrent requests need them. It answers invoke / ainvoke with a message
+object like the chat clients, so llm_integration treats every provider the
+same way.
+
+Settings (environment or .env):
+    LLAMACPP_MODEL_PATH   path to the .gguf file
+    LLAMACPP_N_THREADS    CPU threads per instance (default 8)
+    LLAMACPP_N_CTX        context size in tokens (default 4096)
+    LLAMACPP_POOL_SIZE    model instances kept loaded (default 1)
+"""
+
+import asyncio
+import os
+import queue
+import threading
+from typing import Any
+
+from langchain_core.messages import AIMessage
+
+from core.docstring_engine.messages import prompt_text
+
+
+def _load_llamacpp(**kwargs: Any) -> Any:
+    # optional dependency: llama-cpp-python is only needed for this provider
+    from langchain_community.llms import LlamaCpp
+
+    return LlamaCpp(**kwargs)
+
+
+class LlamaCppPool:
+    """
+    Up to pool_size loaded LlamaCpp instances, each used by one request at a time.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        temperature: float = 0.3,
+        n_threads: int = 8,
+        n_ctx: int = 4096,
+        pool_size: int = 1,
+    ):
+        self.model_path = model_path
+        self.pool_size = max(pool_size, 1)
+        self._settings = {
+            "model_path": model_path,
+            "temperature": temperature,
+            "n_threads": n_threads,
+            "n_ctx": n_ctx,
+            "n_gpu_layers": 0,
+        }
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._loaded = 0
+        self._lock = threading.Lock()
+        # warm: the first request should not pay for loading the model
+        self._idle.put(self._load())
+
+    def _load(self) -> Any:
+        with self._lock:
+            self._loaded += 1
+        return _load_llamacpp(**self._settings)
+
+    def _checkout(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self._loaded < self.pool_size
+            if grow:
+                # reserve the slot now so concurrent callers do not over-allocate
+                self._loaded += 1
+        if grow:
+            try:
+                return _load_llamacpp(**self._settings)
+            except Exception:
+                with self._lock:
+                    self._loaded -= 1
+                raise
+        return self._idle.get()
+
+    def invoke(self, messages: Any) -> AIMessage:
+        llm = self._checkout()
+        try:
+            return AIMessage(content=llm.invoke(prompt_text(messages)))
+        finally:
+            self._idle.put(llm)
+
+    async def ainvoke(self, messages: Any) -> AIMessage:
+        # llama.cpp inference is blocking; run it on a worker thread
+        return await asyncio.to_thread(self.invoke, messages)
+
+    @property
+    def loaded(self) -> int:
+        """Number of model instances loaded so far."""
+        return self._loaded
+
+
+def llamacpp_client(model: str, temperature: float) -> LlamaCppPool:
+    """ClientRegistry factory: model is the .gguf path."""
+    if not model:
+        raise RuntimeError("LLAMACPP_MODEL_PATH not set")
+    return LlamaCppPool(
+        model_path=model,
+        temperature=temperature,
+        n_threads=int(os.getenv("LLAMACPP_N_THREADS", "8")),
+        n_ctx=int(os.getenv("LLAMACPP_N_CTX", "4096")),
+        pool_size=int(os.getenv("LLAMACPP_POOL_SIZE", "1")),
+    )
@@ -0,0 +1,14 @@
+"""
+core.docstring_engine.messages
+
+Helpers for the chat messages passed to LLM clients.
+"""
+
+from typing import Any
+
+
+def prompt_text(messages: Any) -> str:
+    """The prompt as one string: messages itself, or the message contents joined by newlines."""
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(getattr(m, "content", str(m)) for m in messages)
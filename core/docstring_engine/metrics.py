@@ -0,0 +1,159 @@
+"""
+core.docstring_engine.metrics
+
+Instrumentation for LLM provider calls.
+
+Every request that reaches a provider is recorded (model, outcome,
+latency, prompt / completion tokens), along with response cache lookups,
+retries and how responses parsed. summary() reduces this to counters,
+latency percentiles (p50 / p95 / p99), token totals, the fallback rate
+(responses that did not parse and got placeholder content), the salvage
+rate (malformed responses repaired instead of retried) and the cache hit
+rate. export_json / export_csv write the summary and the per-call log to
+local files.
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+from core.docstring_engine.defaults import process_default
+
+# per-call records kept for percentiles and export
+MAX_CALLS = 100_000
+
+_CSV_FIELDS = ("ts", "model", "outcome", "functions", "latency_seconds", "prompt_tokens", "completion_tokens")
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0-100) of values; 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(-(-p * len(ordered) // 100)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LLMMetrics:
+    """
+    Counters, histograms and a per-call log. Thread-safe.
+    """
+
+    def __init__(self, max_calls: int = MAX_CALLS):
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Deque[float]] = {}
+        self.calls: Deque[Dict[str, Any]] = deque(maxlen=max_calls)
+        self._max_calls = max_calls
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self.histograms.setdefault(name, deque(maxlen=self._max_calls)).append(value)
+
+    def record_call(
+        self,
+        model: str,
+        outcome: str,
+        functions: int,
+        latency_seconds: float,
+        prompt_tokens: int,
+        completion_tokens: int,
+    ) -> None:
+        """
+        One provider request. outcome: ok, salvaged (repaired JSON), partial
+        (some batch items missing), unparsed (retried), fallback
+        (placeholder content) or error.
+        """
+        call = {
+            "ts": round(time.time(), 3),
+            "model": model,
+            "outcome": outcome,
+            "functions": functions,
+            "latency_seconds": round(latency_seconds, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        }
+        with self._lock:
+            self.calls.append(call)
+        self.incr("calls")
+        self.incr(f"outcome.{outcome}")
+        self.incr("prompt_tokens", prompt_tokens)
+        self.incr("completion_tokens", completion_tokens)
+        self.observe("latency_seconds", latency_seconds)
+
+    def record_cache(self, hit: bool) -> None:
+        self.incr("cache.hits" if hit else "cache.misses")
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            latencies = list(self.histograms.get("latency_seconds", ()))
+        calls = counters.get("calls", 0)
+        lookups = counters.get("cache.hits", 0) + counters.get("cache.misses", 0)
+        answered = calls - counters.get("outcome.error", 0)
+        salvaged, failed = counters.get("json.salvaged", 0), counters.get("json.failed", 0)
+        return {
+            "calls": calls,
+            "errors": counters.get("outcome.error", 0),
+            "retries": counters.get("retries", 0),
+            "latency_seconds": {
+                "p50": round(percentile(latencies, 50), 4),
+                "p95": round(percentile(latencies, 95), 4),
+                "p99": round(percentile(latencies, 99), 4),
+                "mean": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+                "max": round(max(latencies), 4) if latencies else 0.0,
+            },
+            "prompt_tokens": counters.get("prompt_tokens", 0),
+            "completion_tokens": counters.get("completion_tokens", 0),
+            "fallback_rate": round(counters.get("outcome.fallback", 0) / answered, 4) if answered else 0.0,
+            "partial_rate": round(counters.get("outcome.partial", 0) / answered, 4) if answered else 0.0,
+            "cache_hit_rate": round(counters.get("cache.hits", 0) / lookups, 4) if lookups else 0.0,
+            "json": {
+                "clean": counters.get("json.clean", 0),
+                "salvaged": salvaged,
+                "failed": failed,
+                # share of malformed responses that were repaired instead of retried
+                "salvage_rate": round(salvaged / (salvaged + failed), 4) if salvaged + failed else 0.0,
+            },
+            "counters": counters,
+        }
+
+    def export_json(self, path: str) -> str:
+        """Write the summary and the call log to path (JSON); returns path."""
+        with self._lock:
+            calls = list(self.calls)
+        _ensure_parent(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "calls": calls}, f, indent=2)
+        return path
+
+    def export_csv(self, path: str) -> str:
+        """Write one row per call to path (CSV); returns path."""
+        with self._lock:
+            calls = list(self.calls)
+        _ensure_parent(path)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=_CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(calls)
+        return path
+
+
+def _ensure_parent(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+@process_default
+def default_metrics() -> LLMMetrics:
+    """Process-wide metrics every provider call is recorded to."""
+    return LLMMetrics()
@@ -0,0 +1,93 @@
+"""
+core.docstring_engine.prefetch
+
+Background warming of docstring content for files the user is likely to
+open next.
+
+A PrefetchQueue holds (file, functions) jobs in priority order and works
+through them one file at a time on a worker thread, with a small request
+budget so the file on screen keeps most of the rate limit. Content lands in
+the generator's memo and the queue's own memo (a UI session cache), so
+opening a warmed file needs no LLM call. Calling schedule() again replaces
+the remaining jobs; the file being generated at that moment is finished.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Sequence, Tuple
+
+from core.docstring_engine.clients import ClientRegistry
+from core.docstring_engine.generator import generate_contents
+
+Job = Tuple[str, List[Dict[str, Any]]]
+
+
+def prioritize(pending: Dict[str, List[Dict[str, Any]]], visible: Sequence[str], limit: int) -> List[Job]:
+    """
+    Order files for prefetching: the visible ones first (in the given order),
+    then the rest by how many functions still need docstrings. Files with
+    nothing pending are skipped; at most limit jobs are returned.
+    """
+    order = [path for path in visible if pending.get(path)]
+    rest = sorted((path for path in pending if path not in order and pending[path]), key=lambda p: -len(pending[p]))
+    return [(path, pending[path]) for path in (order + rest)[:limit]]
+
+
+class PrefetchQueue:
+    """
+    Priority queue of files whose content is generated in the background.
+    """
+
+    def __init__(
+        self,
+        clients: Optional[ClientRegistry] = None,
+        max_concurrency: int = 2,
+        memo: Optional[MutableMapping[str, Dict]] = None,
+    ):
+        self.clients = clients
+        self.max_concurrency = max_concurrency
+        self.memo = memo
+        self.warmed = 0
+        self.failed = 0
+        self._jobs: List[Job] = []
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def schedule(self, jobs: Iterable[Job]) -> None:
+        """Replace the queued jobs with jobs, highest priority first."""
+        with self._lock:
+            self._jobs = [(path, list(functions)) for path, functions in jobs if functions]
+            if self._jobs and self._worker is None:
+                # the worker exits when the queue runs dry, so idle sessions hold no thread
+                self._worker = threading.Thread(target=self._run, name="docstring-prefetch", daemon=True)
+                self._worker.start()
+
+    def _next(self) -> Optional[Job]:
+        with self._lock:
+            if not self._jobs:
+                # under the lock, so schedule() starts a new worker after this
+                self._worker = None
+                return None
+            return self._jobs.pop(0)
+
+    def _run(self) -> None:
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            _, functions = job
+            try:
+                results = generate_contents(functions, self.max_concurrency, self.clients, memo=self.memo)
+            except Exception:
+                results = [None]
+            with self._lock:
+                self.warmed += 1
+                self.failed += any(r is None or isinstance(r, Exception) for r in results)
+
+    def pending(self) -> List[str]:
+        """Files still queued, in order."""
+        with self._lock:
+            return [path for path, _ in self._jobs]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"queued": len(self._jobs), "warmed_files": self.warmed, "files_with_failures": self.failed}
@@ -0,0 +1,201 @@
+"""
+core.docstring_engine.rate_limit
+
+Client-side rate limiting and retry for LLM requests.
+
+A RateLimiter holds two token buckets, one in requests per minute and one
+in (estimated) tokens per minute. Callers reserve capacity before each
+request and sleep for the time the buckets need to refill, so large jobs run
+at the provider's limit instead of running into it. When the provider still
+answers 429, every caller pauses for its Retry-After; other transient
+errors are retried with jittered exponential backoff.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from core.docstring_engine.defaults import process_default
+from core.docstring_engine.metrics import default_metrics
+
+
+class _Bucket:
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        # the level may go negative: later callers queue behind this reservation
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(amount, self.capacity)
+        return -self.level / self.rate if self.level < 0 else 0.0
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter shared by every thread and event loop in the process.
+
+    A limit of None disables that bucket (local models have no quota).
+
+    Tracks how long callers waited for capacity (wait_seconds_total,
+    max_wait_seconds) and how many retries were needed, for stats().
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = 30, tokens_per_minute: Optional[float] = 6000):
+        self._requests = _Bucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute) if tokens_per_minute else None
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        self.retries = 0
+        self.rate_limited = 0
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Take capacity for one request of about `tokens` tokens and return
+        how many seconds the caller must wait before sending it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self._resume_at - now,
+                self._requests.reserve(1, now) if self._requests else 0.0,
+                self._tokens.reserve(tokens, now) if self._tokens else 0.0,
+                0.0,
+            )
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.wait_seconds_total += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until a request of about `tokens` tokens may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Async version of acquire."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for seconds (the provider said we are over the limit)."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+            self.rate_limited += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "wait_seconds_total": round(self.wait_seconds_total, 3),
+                "max_wait_seconds": round(self.max_wait_seconds, 3),
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+            }
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except (TypeError, ValueError):
+        # HTTP-date form is not used by the providers we call
+        return None
+
+
+def _is_transient(exc: Exception) -> bool:
+    status = _status_code(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError", "TimeoutError", "ConnectionError")
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff for retry number attempt (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _retry_delay(limiter: RateLimiter, exc: Exception, attempt: int) -> Optional[float]:
+    """
+    Seconds this caller should sleep before retrying, or None if exc is not
+    retryable. Rate-limit waits are applied to the limiter instead, so they
+    hold back every caller.
+    """
+    if not _is_transient(exc):
+        return None
+    limiter.record_retry()
+    default_metrics().incr("retries")
+    if _status_code(exc) == 429:
+        after = _retry_after(exc)
+        limiter.pause(after if after is not None else backoff_delay(attempt))
+        return 0.0
+    return backoff_delay(attempt)
+
+
+def invoke_with_retry(llm: Any, messages: Any, tokens: int, limiter: Optional[RateLimiter] = None, max_retries: int = 5):
+    """llm.invoke(messages) under the rate limiter, retrying transient failures."""
+    limiter = limiter if limiter is not None else default_rate_limiter()
+    for attempt in range(max_retries + 1):
+        limiter.acquire(tokens)
+        try:
+            return llm.invoke(messages)
+        except Exception as e:
+            delay = _retry_delay(limiter, e, attempt) if attempt < max_retries else None
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+
+async def ainvoke_with_retry(
+    llm: Any, messages: Any, tokens: int, limiter: Optional[RateLimiter] = None, max_retries: int = 5
+):
+    """Async version of invoke_with_retry (uses llm.ainvoke)."""
+    limiter = limiter if limiter is not None else default_rate_limiter()
+    for attempt in range(max_retries + 1):
+        await limiter.aacquire(tokens)
+        try:
+            return await llm.ainvoke(messages)
+        except Exception as e:
+            delay = _retry_delay(limiter, e, attempt) if attempt < max_retries else None
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+
+
+@process_default
+def default_rate_limiter() -> RateLimiter:
+    """
+    The process-wide limiter, sized from LLM_REQUESTS_PER_MINUTE and
+    LLM_TOKENS_PER_MINUTE (defaults: Groq free tier for llama-3.1-8b-instant).
+    """
+    return RateLimiter(
+        requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "30")),
+        tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "6000")),
+    )
@@ -0,0 +1,138 @@
+"""
+core.docstring_engine.response_cache
+
+Persistent cache for LLM docstring content.
+
+Entries are keyed by a hash of everything that shapes the response: the
+prompt inputs taken from the function record, the model, the temperature
+and the prompt-template version. Entries expire after a TTL and the cache
+is bounded by entry count, evicting least recently used entries, so
+repeated previews and re-scans are answered without an API call.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from core.docstring_engine.defaults import process_default
+
+DEFAULT_RESPONSE_CACHE_PATH = os.path.join("storage", "llm_cache.sqlite")
+
+
+def response_key(inputs: Dict[str, Any], model: str, temperature: float, prompt_version: str) -> str:
+    """Hash of the prompt inputs and generation settings."""
+    payload = json.dumps(
+        {"inputs": inputs, "model": model, "temperature": temperature, "prompt_version": prompt_version},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache stored under storage/.
+
+    Safe to share between threads (Streamlit reruns, concurrent generation).
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_RESPONSE_CACHE_PATH,
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_entries: int = 50_000,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used);
+            """
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached content for key, or None if missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT data, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, content: Dict[str, Any]) -> None:
+        """
+        Store content for key and apply the size bound.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, data, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(content), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used, rowid LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process and the number of stored entries."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "LLMResponseCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@process_default
+def default_response_cache() -> LLMResponseCache:
+    """The process-wide cache at storage/llm_cache.sqlite, opened on first use."""
+    return LLMResponseCache()
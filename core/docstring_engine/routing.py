@@ -0,0 +1,99 @@
+"""
+core.docstring_engine.routing
+
+Complexity-aware model routing.
+
+Most functions are simple enough for the fast, cheap model; only functions
+the parser measures as complex (high complexity, deep nesting, many
+arguments or several raised exceptions) are sent to the large model. The
+router decides the tier and keeps per-model request, latency and token
+totals so the effect of the thresholds can be checked.
+
+Thresholds (environment or .env); a function above any of them is complex:
+    LLM_ROUTE_MAX_COMPLEXITY  heuristic complexity (default 5)
+    LLM_ROUTE_MAX_NESTING     nesting depth (default 3)
+    LLM_ROUTE_MAX_ARGS        arguments, self/cls excluded (default 5)
+    LLM_ROUTE_MAX_RAISES      distinct raised exceptions (default 2)
+"""
+
+import os
+import threading
+from typing import Any, Dict
+
+from core.docstring_engine.defaults import process_default
+
+
+class ModelRouter:
+    """
+    Routing thresholds plus per-model usage totals. Thread-safe.
+    """
+
+    def __init__(self, max_complexity: int = 5, max_nesting: int = 3, max_args: int = 5, max_raises: int = 2):
+        self.max_complexity = max_complexity
+        self.max_nesting = max_nesting
+        self.max_args = max_args
+        self.max_raises = max_raises
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def is_complex(self, fn: Dict[str, Any]) -> bool:
+        """Whether fn exceeds any threshold and should go to the large model."""
+        args = [a for a in fn.get("args", []) if a["name"] not in ("self", "cls")]
+        return (
+            (fn.get("complexity") or 1) > self.max_complexity
+            or (fn.get("nesting_depth") or 0) > self.max_nesting
+            or len(args) > self.max_args
+            or len(set(fn.get("raises") or [])) > self.max_raises
+        )
+
+    def record(
+        self,
+        model: str,
+        functions: int,
+        latency_seconds: float,
+        prompt_tokens: int,
+        completion_tokens: int,
+        failed: bool = False,
+    ) -> None:
+        """Add one finished request to model's totals."""
+        with self._lock:
+            totals = self._models.setdefault(model, {
+                "requests": 0,
+                "failed": 0,
+                "functions": 0,
+                "latency_seconds_total": 0.0,
+                "max_latency_seconds": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+            })
+            totals["requests"] += 1
+            totals["failed"] += failed
+            totals["functions"] += functions
+            totals["latency_seconds_total"] += latency_seconds
+            totals["max_latency_seconds"] = max(totals["max_latency_seconds"], latency_seconds)
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model totals, with mean_latency_seconds."""
+        with self._lock:
+            stats = {}
+            for model, totals in self._models.items():
+                stats[model] = {
+                    **totals,
+                    "latency_seconds_total": round(totals["latency_seconds_total"], 3),
+                    "max_latency_seconds": round(totals["max_latency_seconds"], 3),
+                    "mean_latency_seconds": round(totals["latency_seconds_total"] / totals["requests"], 3),
+                }
+            return stats
+
+
+@process_default
+def default_router() -> ModelRouter:
+    """Process-wide router with thresholds from the LLM_ROUTE_* settings."""
+    return ModelRouter(
+        max_complexity=int(os.getenv("LLM_ROUTE_MAX_COMPLEXITY", "5")),
+        max_nesting=int(os.getenv("LLM_ROUTE_MAX_NESTING", "3")),
+        max_args=int(os.getenv("LLM_ROUTE_MAX_ARGS", "5")),
+        max_raises=int(os.getenv("LLM_ROUTE_MAX_RAISES", "2")),
+    )
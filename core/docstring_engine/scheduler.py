@@ -0,0 +1,60 @@
+"""
+core.docstring_engine.scheduler
+
+Groups functions whose prompts are identical so the LLM is asked once per
+group.
+
+The prompt is built only from a function's signature (name, arguments,
+return type, raises) and the model it is routed to, so every function with
+the same content_key gets the same content: methods repeated across
+modules, vendored copies, overloads and stubs. The scheduler requests
+content for one representative per key and the generator fans the result
+out to every member; stats() reports how many requests that saved.
+"""
+
+import threading
+from typing import Any, Dict, List
+
+from core.docstring_engine.defaults import process_default
+from core.docstring_engine.llm_integration import content_key
+
+
+class DedupScheduler:
+    """
+    Plans one LLM request per group of functions with identical prompts and
+    counts how many functions were served per request. Thread-safe.
+    """
+
+    def __init__(self):
+        self.functions = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def group(self, functions: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Indexes into functions grouped by content_key, in first-seen order.
+        The first index of each group is its representative.
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, fn in enumerate(functions):
+            groups.setdefault(content_key(fn), []).append(index)
+        with self._lock:
+            self.functions += len(functions)
+            self.requests += len(groups)
+        return list(groups.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            deduplicated = self.functions - self.requests
+            return {
+                "functions": self.functions,
+                "unique": self.requests,
+                "deduplicated": deduplicated,
+                "dedup_ratio": round(deduplicated / self.functions, 4) if self.functions else 0.0,
+            }
+
+
+@process_default
+def default_scheduler() -> DedupScheduler:
+    """Process-wide scheduler used by the generator."""
+    return DedupScheduler()
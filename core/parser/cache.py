@@ -0,0 +1,206 @@
+"""
+core.parser.cache
+
+Persistent, content-addressed cache for parse_file results.
+
+Entries are keyed by a hash of the file content, the parser version and the
+Python version, so identical files share one entry and a parser upgrade
+never serves stale records. A stat index (mtime + size per path) lets warm
+scans skip reading and hashing files that have not changed. The cache is
+bounded by entry count and total size and evicts least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from core.parser.python_parser import PARSER_VERSION
+from core.parser.records import class_from_dict, function_from_dict, to_jsonable_lazy
+
+DEFAULT_CACHE_PATH = os.path.join("storage", "parse_cache.sqlite")
+
+
+class CacheLookup(NamedTuple):
+    """
+    Outcome of ParseCache.lookup for one file.
+
+    result is the cached parse record on a hit. On a miss, source holds the
+    bytes that were hashed so the caller can parse exactly that content, and
+    key / stat are passed back to ParseCache.store.
+    """
+
+    result: Optional[Dict[str, Any]]
+    key: Optional[str]
+    source: Optional[bytes]
+    stat: Optional[Tuple[int, int]]
+
+
+def _from_json(payload: str) -> Dict[str, Any]:
+    data = json.loads(payload)
+    data["functions"] = [function_from_dict(fn) for fn in data["functions"]]
+    data["classes"] = [class_from_dict(c) for c in data["classes"]]
+    # JSON round-trips copy methods; point them back at the function records
+    by_pos = {(fn.get("name"), fn.get("start_line")): fn for fn in data.get("functions", [])}
+    for cls in data.get("classes", []):
+        if "methods" in cls:
+            cls["methods"] = [by_pos.get((m.get("name"), m.get("start_line")), m) for m in cls["methods"]]
+    return data
+
+
+class ParseCache:
+    """
+    SQLite-backed parse cache stored under storage/.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = 100_000,
+        max_bytes: int = 256 * 1024 * 1024,
+        namespace: str = "parse",
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # namespace separates records built by different file parsers (e.g. review_file)
+        self._namespace = namespace
+        self._salt = f"{namespace}:{PARSER_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:".encode()
+
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stat_index (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used);
+            """
+        )
+
+    def _index_path(self, path: str) -> str:
+        # salted like the entry keys, so a parser upgrade never reuses an old index row
+        return self._salt.decode() + os.path.abspath(path)
+
+    def _key(self, source: bytes) -> str:
+        return hashlib.sha256(self._salt + source).hexdigest()
+
+    def _load(self, key: str, path: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            data = _from_json(row[0])
+        except (KeyError, TypeError, ValueError):
+            # written by an incompatible parser; reparse and overwrite it
+            return None
+        self._conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        # identical content may live at several paths
+        data["file_path"] = path
+        return data
+
+    def lookup(self, path: str) -> CacheLookup:
+        """
+        Return the cached record for path, reading and hashing the file only
+        when its mtime or size differ from the last scan.
+        """
+        index_path = self._index_path(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.misses += 1
+            return CacheLookup(None, None, None, None)
+        stat = (st.st_mtime_ns, st.st_size)
+
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, key FROM stat_index WHERE path = ?", (index_path,)
+        ).fetchone()
+        if row is not None and (row[0], row[1]) == stat:
+            result = self._load(row[2], path)
+            if result is not None:
+                self.hits += 1
+                return CacheLookup(result, row[2], None, stat)
+
+        try:
+            with open(path, "rb") as fh:
+                source = fh.read()
+        except OSError:
+            self.misses += 1
+            return CacheLookup(None, None, None, None)
+
+        key = self._key(source)
+        result = self._load(key, path)
+        if result is not None:
+            self.hits += 1
+            self._index(index_path, stat, key)
+            return CacheLookup(result, key, source, stat)
+
+        self.misses += 1
+        return CacheLookup(None, key, source, stat)
+
+    def _index(self, index_path: str, stat: Tuple[int, int], key: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO stat_index (path, mtime_ns, size, key) VALUES (?, ?, ?, ?)",
+            (index_path, stat[0], stat[1], key),
+        )
+
+    def store(self, path: str, lookup: CacheLookup, data: Dict[str, Any]) -> None:
+        """
+        Record a freshly parsed result for a miss returned by lookup.
+        """
+        if lookup.key is None:
+            return
+        payload = json.dumps(data, default=to_jsonable_lazy)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries (key, data, size, last_used) VALUES (?, ?, ?, ?)",
+            (lookup.key, payload, len(payload), time.time()),
+        )
+        self._index(self._index_path(path), lookup.stat, lookup.key)
+
+    def _evict(self) -> None:
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall()
+        evicted = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        self._conn.executemany("DELETE FROM stat_index WHERE key = ?", evicted)
+
+    def flush(self) -> None:
+        """
+        Apply size bounds and persist pending writes.
+        """
+        self._evict()
+        self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -9,11 +9,32 @@ Extracts:
 - simple complexity estimate (heuristic)
 - nesting depth
 - presence of docstring
+
+Functions and classes are returned as FunctionInfo / ClassInfo records
+(core.parser.records), which support the same dict-style access.
 """
 
 import ast
 import os
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from core.parser.coverage_scan import scan_file_coverage
+from core.parser.records import ArgInfo, ClassInfo, FunctionInfo, LazyExpr
+from core.parser.source_unit import SourceUnit
+
+if TYPE_CHECKING:
+    from core.parser.cache import ParseCache
+
+# Bump whenever the shape or content of parse_file output changes; it is part
+# of the persistent parse cache key.
+PARSER_VERSION = "6"
+
+# Files handed to a pool worker per task, and tasks kept in flight per worker.
+_CHUNK_SIZE = 16
+_CHUNKS_PER_WORKER = 2
 
 
 def _get_annotation_str(node: Optional[ast.AST]) -> Optional[str]:
@@ -43,175 +64,324 @@ def _get_default_str(node: Optional[ast.AST]) -> Optional[str]:
     return None
 
 
-def _simple_complexity(node: ast.FunctionDef) -> int:
+class _ExprRenderer:
     """
-    Heuristic estimate for cyclomatic complexity:
-    Count occurrences of: If, For, While, With, Try, BooleanOp, Comprehension
-    Minimum complexity = 1.
+    Turns annotation, default, decorator and raise nodes into record values.
+
+    With the module source, anything other than a plain (dotted) name becomes
+    a LazyExpr holding the expression's source text, so ast.unparse only runs
+    for fields that are actually read. Without the source (parse_functions on
+    a bare node) expressions are unparsed eagerly.
     """
-    counter = 1
-
-    class Visitor(ast.NodeVisitor):
-        def visit_If(self, n):  # noqa: N802
-            nonlocal counter
-            counter += 1
-            self.generic_visit(n)
-
-        def visit_For(self, n):  # noqa: N802
-            nonlocal counter
-            counter += 1
-            self.generic_visit(n)
-
-        def visit_While(self, n):  # noqa: N802
-            nonlocal counter
-            counter += 1
-            self.generic_visit(n)
-
-        def visit_With(self, n):  # noqa: N802
-            nonlocal counter
-            counter += 1
-            self.generic_visit(n)
-
-        def visit_Try(self, n):  # noqa: N802
-            nonlocal counter
-            counter += 1
-            self.generic_visit(n)
-
-        def visit_BoolOp(self, n):  # noqa: N802
-            nonlocal counter
-            # boolean ops like a and b add to complexity
-            counter += len(n.values) - 1
-            self.generic_visit(n)
-
-        def visit_ListComp(self, n):  # noqa: N802
-            nonlocal counter
-            counter += 1
-            self.generic_visit(n)
-
-        def visit_DictComp(self, n):  # noqa: N802
-            nonlocal counter
-            counter += 1
-            self.generic_visit(n)
-
-    Visitor().visit(node)
-    return max(counter, 1)
-
-
-def _max_nesting_depth(node: ast.FunctionDef) -> int:
+
+    def __init__(self, unit: Optional[SourceUnit] = None):
+        self._unit = unit
+
+    def render(self, node: Optional[ast.AST], eager: Optional[Callable[[Optional[ast.AST]], Optional[str]]] = None) -> Any:
+        eager = eager or _get_annotation_str
+        if node is None or self._unit is None:
+            return eager(node)
+        try:
+            segment = self._unit.segment(node)
+        except Exception:
+            return eager(node)
+        # ast.unparse returns plain ASCII names unchanged
+        if segment.isascii() and all(part.isidentifier() for part in segment.split(".")):
+            return segment
+        return LazyExpr(segment)
+
+
+# Block statements that count towards the nesting depth of a function.
+_BLOCK_NODES = (ast.If, ast.For, ast.While, ast.With, ast.Try, ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Nodes that add one branch to the heuristic complexity estimate.
+_BRANCH_NODES = (ast.If, ast.For, ast.While, ast.With, ast.Try, ast.ListComp, ast.DictComp)
+
+
+def _docstring_node(n: ast.AST) -> Optional[ast.AST]:
+    body = n.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        return body[0]
+    return None
+
+
+class _FunctionFrame:
     """
-    Compute maximum block nesting depth inside function body.
+    Running totals for a function whose subtree is still being visited.
     """
 
-    max_depth = 0
-
-    class DepthVisitor(ast.NodeVisitor):
-        def __init__(self):
-            super().__init__()
-            self.depth = 0
-            self.max_depth = 0
-
-        def generic_visit(self, n):
-            is_block = isinstance(n, (ast.If, ast.For, ast.While, ast.With, ast.Try, ast.FunctionDef, ast.AsyncFunctionDef))
-            if is_block:
-                self.depth += 1
-                if self.depth > self.max_depth:
-                    self.max_depth = self.depth
-                super().generic_visit(n)
-                self.depth -= 1
-            else:
-                super().generic_visit(n)
+    __slots__ = ("node", "ast_depth", "order", "base_depth", "max_depth", "complexity", "raises", "yields")
 
-    v = DepthVisitor()
-    v.visit(node)
-    return v.max_depth
+    def __init__(self, node: ast.AST, ast_depth: int, order: int, block_depth: int):
+        self.node = node
+        self.ast_depth = ast_depth
+        self.order = order
+        self.base_depth = block_depth - 1
+        self.max_depth = block_depth
+        self.complexity = 1
+        self.raises: List[str] = []
+        self.yields = False
 
 
-def parse_functions(node: ast.AST) -> List[Dict[str, Any]]:
-    funcs = []
-    for n in ast.walk(node):
-        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            try:
-                sig_args = []
-                for arg in n.args.args:
-                    ann = _get_annotation_str(arg.annotation)
-                    sig_args.append({"name": arg.arg, "annotation": ann, "default": None})
-                # handle defaults (map from end)
-                total_args = len(n.args.args)
-                num_defaults = len(n.args.defaults)
-                if num_defaults:
-                    for i in range(num_defaults):
-                        arg_index = total_args - num_defaults + i
-                        default_node = n.args.defaults[i]
-                        sig_args[arg_index]["default"] = _get_default_str(default_node)
-
-                returns = _get_annotation_str(n.returns)
-                doc = ast.get_docstring(n)
-                start_line = getattr(n, "lineno", None)
-                end_line = getattr(n, "end_lineno", None)
-                complexity = _simple_complexity(n)
-                nesting = _max_nesting_depth(n)
-                # quick scan for raises and yields
-                raises = []
-                yields = False
-                for sub in ast.walk(n):
-                    if isinstance(sub, ast.Raise):
-                        # try to get raised exception name
-                        exc = getattr(sub, "exc", None)
-                        raises.append(_get_annotation_str(exc) or "Exception")
-                    if isinstance(sub, (ast.Yield, ast.YieldFrom)):
-                        yields = True
-
-                indent = n.col_offset        
-
-                funcs.append(
-                    {
-                        "name": n.name,
-                        "args": sig_args,
-                        "returns": returns,
-                        "decorators": [ast.unparse(d) if hasattr(ast, "unparse") else None for d in n.decorator_list],
-                        "has_docstring": bool(doc),
-                        "docstring": doc,
-                        "start_line": start_line,
-                        "end_line": end_line,
-                        "complexity": complexity,
-                        "nesting_depth": nesting,
-                        "raises": list(set(raises)),
-                        "yields": yields,
-                        "indent": indent,
-                    }
-                )
-            except Exception as e:
-                # skip problematic function but record error in top-level parser
-                funcs.append({"name": getattr(n, "name", "<unknown>"), "parse_error": str(e)})
-    return funcs
-
-
-def parse_classes(node: ast.AST) -> List[Dict[str, Any]]:
-    classes = []
-    for n in ast.walk(node):
-        if isinstance(n, ast.ClassDef):
-            try:
-                methods = []
-                for body_item in n.body:
-                    if isinstance(body_item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        # reuse parse_functions logic by wrapping into module
-                        method_info = parse_functions(body_item)[0] if parse_functions(body_item) else {}
-                        methods.append(method_info)
-                doc = ast.get_docstring(n)
-                classes.append(
-                    {
-                        "name": n.name,
-                        "bases": [_get_annotation_str(b) for b in n.bases],
-                        "has_docstring": bool(doc),
-                        "docstring": doc,
-                        "start_line": getattr(n, "lineno", None),
-                        "end_line": getattr(n, "end_lineno", None),
-                        "methods": methods,
-                    }
-                )
-            except Exception as e:
-                classes.append({"name": getattr(n, "name", "<unknown>"), "parse_error": str(e)})
-    return classes
+class _ModuleAnalyzer:
+    """
+    Single-pass analyzer that collects metadata for every function and class in a tree.
+
+    Complexity, nesting depth, raises and yields of nested functions are
+    folded into their enclosing function when the nested one is closed, so
+    each node is visited exactly once regardless of how deep functions nest.
+
+    Heuristic complexity counts: If, For, While, With, Try, BooleanOp,
+    Comprehension (minimum 1). Nesting depth counts the function itself plus
+    every enclosing block statement inside it.
+
+    Class methods are linked to the function records built during the same
+    pass instead of being analyzed again.
+    """
+
+    def __init__(self, unit: Optional[SourceUnit] = None):
+        self._exprs = _ExprRenderer(unit)
+        self._frames: List[_FunctionFrame] = []
+        self._ast_depth = 0
+        self._block_depth = 0
+        self._order = 0
+        self._records: List[Any] = []
+        self._class_nodes: List[Any] = []
+        self._by_node: Dict[int, Any] = {}
+
+    def visit(self, node: ast.AST) -> None:
+        order = self._order
+        self._order += 1
+
+        is_block = isinstance(node, _BLOCK_NODES)
+        if is_block:
+            self._block_depth += 1
+
+        is_function = isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        if isinstance(node, ast.ClassDef):
+            self._class_nodes.append((self._ast_depth, order, node))
+
+        if is_function:
+            self._frames.append(_FunctionFrame(node, self._ast_depth, order, self._block_depth))
+
+        if self._frames:
+            frame = self._frames[-1]
+            if is_block and self._block_depth > frame.max_depth:
+                frame.max_depth = self._block_depth
+            if isinstance(node, _BRANCH_NODES):
+                frame.complexity += 1
+            elif isinstance(node, ast.BoolOp):
+                # boolean ops like a and b add to complexity
+                frame.complexity += len(node.values) - 1
+            elif isinstance(node, ast.Raise):
+                # try to get raised exception name
+                frame.raises.append(self._exprs.render(node.exc) or "Exception")
+            elif isinstance(node, (ast.Yield, ast.YieldFrom)):
+                frame.yields = True
+
+        self._ast_depth += 1
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+        self._ast_depth -= 1
+
+        if is_function:
+            self._close_function()
+        if is_block:
+            self._block_depth -= 1
+
+    def _close_function(self) -> None:
+        frame = self._frames.pop()
+        if self._frames:
+            parent = self._frames[-1]
+            parent.complexity += frame.complexity - 1
+            parent.max_depth = max(parent.max_depth, frame.max_depth)
+            parent.raises.extend(frame.raises)
+            parent.yields = parent.yields or frame.yields
+        record = _build_function_record(frame, self._exprs)
+        self._by_node[id(frame.node)] = record
+        self._records.append((frame.ast_depth, frame.order, record))
+
+    def functions(self) -> List[Mapping[str, Any]]:
+        """
+        Return function records in breadth-first (``ast.walk``) order.
+        """
+        return [rec for _, _, rec in sorted(self._records, key=lambda r: (r[0], r[1]))]
+
+    def classes(self) -> List[Mapping[str, Any]]:
+        """
+        Return class records in breadth-first (``ast.walk``) order.
+
+        ``methods`` holds the same records returned by ``functions()``.
+        """
+        ordered = sorted(self._class_nodes, key=lambda r: (r[0], r[1]))
+        return [_build_class_record(n, self._by_node, self._exprs) for _, _, n in ordered]
+
+
+# Bodies longer than this (docstring excluded) get no body_shape.
+_SHAPE_MAX_STATEMENTS = 4
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _self_attr(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in ("self", "cls"):
+        return node.attr
+    return None
+
+
+def _is_super_init(s: ast.AST) -> bool:
+    return (
+        isinstance(s, ast.Expr)
+        and isinstance(s.value, ast.Call)
+        and isinstance(s.value.func, ast.Attribute)
+        and s.value.func.attr == "__init__"
+        and isinstance(s.value.func.value, ast.Call)
+        and _dotted_name(s.value.func.value.func) == "super"
+    )
+
+
+def _body_shape(n: ast.AST) -> Optional[Dict[str, Any]]:
+    """
+    Classify very small function bodies for rule-based docstrings:
+
+    - {"kind": "assign_fields", "fields": [[attr, arg or None], ...]}:
+      only ``self.attr = <arg or other value>`` statements (and
+      ``super().__init__(...)``)
+    - {"kind": "return_attr", "attr": attr}: ``return self.attr``
+    - {"kind": "delegate", "target": dotted, "passes": [arg, ...]}:
+      ``return f(...)`` or a bare ``f(...)`` call
+    - {"kind": "return_value"}: returns some other single expression
+    - {"kind": "empty"}: ``pass`` / ``...`` only
+
+    Every shape has "statements" (body size without the docstring).
+    Returns None for anything longer or different.
+    """
+    body = n.body[1:] if _docstring_node(n) is not None else n.body
+    if len(body) > _SHAPE_MAX_STATEMENTS:
+        return None
+    statements = len(body)
+    if all(isinstance(s, ast.Pass) or (isinstance(s, ast.Expr) and isinstance(s.value, ast.Constant)) for s in body):
+        return {"kind": "empty", "statements": statements}
+
+    params = {a.arg for a in n.args.args + n.args.kwonlyargs}
+    fields = []
+    for s in body:
+        if _is_super_init(s):
+            continue
+        if not (isinstance(s, ast.Assign) and len(s.targets) == 1) and not (
+            isinstance(s, ast.AnnAssign) and s.value is not None
+        ):
+            break
+        target = s.targets[0] if isinstance(s, ast.Assign) else s.target
+        attr = _self_attr(target)
+        if attr is None:
+            break
+        value = s.value
+        fields.append([attr, value.id if isinstance(value, ast.Name) and value.id in params else None])
+    else:
+        return {"kind": "assign_fields", "fields": fields, "statements": statements}
+
+    if statements != 1:
+        return None
+    stmt = body[0]
+    value = stmt.value if isinstance(stmt, (ast.Return, ast.Expr)) else None
+    if value is None:
+        return None
+    if isinstance(stmt, ast.Return) and _self_attr(value) is not None:
+        return {"kind": "return_attr", "attr": _self_attr(value), "statements": 1}
+    if isinstance(value, ast.Call):
+        target = _dotted_name(value.func)
+        if target is not None:
+            passed = [a.id for a in value.args if isinstance(a, ast.Name) and a.id in params]
+            passed += [k.value.id for k in value.keywords if isinstance(k.value, ast.Name) and k.value.id in params]
+            return {"kind": "delegate", "target": target, "passes": passed, "statements": 1}
+    if isinstance(stmt, ast.Return):
+        return {"kind": "return_value", "statements": 1}
+    return None
+
+
+def _build_function_record(frame: _FunctionFrame, exprs: _ExprRenderer) -> Any:
+    n = frame.node
+    try:
+        sig_args = []
+        for arg in n.args.args:
+            ann = exprs.render(arg.annotation)
+            sig_args.append(ArgInfo(arg.arg, ann))
+        # handle defaults (map from end)
+        total_args = len(n.args.args)
+        num_defaults = len(n.args.defaults)
+        if num_defaults:
+            for i in range(num_defaults):
+                arg_index = total_args - num_defaults + i
+                default_node = n.args.defaults[i]
+                sig_args[arg_index].default = exprs.render(default_node, _get_default_str)
+
+        returns = exprs.render(n.returns)
+        doc = ast.get_docstring(n)
+
+        return FunctionInfo(
+            name=n.name,
+            args=sig_args,
+            returns=returns,
+            decorators=[exprs.render(d, ast.unparse) for d in n.decorator_list],
+            has_docstring=bool(doc),
+            docstring=doc,
+            start_line=getattr(n, "lineno", None),
+            end_line=getattr(n, "end_lineno", None),
+            complexity=max(frame.complexity, 1),
+            nesting_depth=frame.max_depth - frame.base_depth,
+            raises=list(set(frame.raises)),
+            yields=frame.yields,
+            indent=n.col_offset,
+            body_shape=_body_shape(n),
+        )
+    except Exception as e:
+        # skip problematic function but record error in top-level parser
+        return {"name": getattr(n, "name", "<unknown>"), "parse_error": str(e)}
+
+
+def _build_class_record(n: ast.ClassDef, by_node: Dict[int, Any], exprs: _ExprRenderer) -> Any:
+    try:
+        methods = []
+        for body_item in n.body:
+            if isinstance(body_item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                methods.append(by_node.get(id(body_item), {}))
+        doc = ast.get_docstring(n)
+        return ClassInfo(
+            name=n.name,
+            bases=[exprs.render(b) for b in n.bases],
+            has_docstring=bool(doc),
+            docstring=doc,
+            start_line=getattr(n, "lineno", None),
+            end_line=getattr(n, "end_lineno", None),
+            methods=methods,
+        )
+    except Exception as e:
+        return {"name": getattr(n, "name", "<unknown>"), "parse_error": str(e)}
+
+
+def _analyze(node: ast.AST, unit: Optional[SourceUnit] = None) -> _ModuleAnalyzer:
+    analyzer = _ModuleAnalyzer(unit)
+    analyzer.visit(node)
+    return analyzer
+
+
+def parse_functions(node: ast.AST) -> List[Mapping[str, Any]]:
+    return _analyze(node).functions()
+
+
+def parse_classes(node: ast.AST) -> List[Mapping[str, Any]]:
+    return _analyze(node).classes()
 
 
 def parse_imports(node: ast.AST) -> List[str]:
@@ -227,48 +397,195 @@ def parse_imports(node: ast.AST) -> List[str]:
     return imports
 
 
-def parse_file(path: str) -> Dict[str, Any]:
-    """
-    Parse a single python file and return metadata.
-    """
-    data = {
+def _empty_file_record(path: str) -> Dict[str, Any]:
+    return {
         "file_path": path,
         "functions": [],
         "classes": [],
         "imports": [],
         "parsing_errors": [],
     }
+
+
+def _record_error(data: Dict[str, Any], e: Exception) -> None:
+    if isinstance(e, SyntaxError):
+        data["parsing_errors"].append({"type": "SyntaxError", "message": str(e)})
+    else:
+        data["parsing_errors"].append({"type": type(e).__name__, "message": str(e)})
+
+
+def parse_unit(unit: SourceUnit) -> Dict[str, Any]:
+    """
+    Parse an already loaded SourceUnit and return metadata (see parse_file).
+    """
+    data = _empty_file_record(unit.path)
     try:
-        with open(path, "r", encoding="utf-8") as fh:
-            src = fh.read()
-        node = ast.parse(src, filename=path)
-        data["functions"] = parse_functions(node)
-        data["classes"] = parse_classes(node)
+        node = unit.tree
+        analyzer = _analyze(node, unit)
+        data["functions"] = analyzer.functions()
+        data["classes"] = analyzer.classes()
         data["imports"] = parse_imports(node)
-    except SyntaxError as e:
-        data["parsing_errors"].append({"type": "SyntaxError", "message": str(e)})
     except Exception as e:
-        data["parsing_errors"].append({"type": type(e).__name__, "message": str(e)})
+        _record_error(data, e)
     return data
 
 
-def parse_path(path: str, recursive: bool = True, skip_dirs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+def parse_file(path: str, source: Optional[bytes] = None) -> Dict[str, Any]:
     """
-    Parse all .py files found at path. If path is a file, parse that file.
-    Returns list of file metadata dicts.
+    Parse a single python file and return metadata.
+
+    source: raw file bytes when the caller has already read the file.
+    """
+    try:
+        unit = SourceUnit.load(path, source)
+    except Exception as e:
+        data = _empty_file_record(path)
+        _record_error(data, e)
+        return data
+    return parse_unit(unit)
+
+
+def _iter_python_files(path: str, skip_dirs: List[str]) -> Iterator[str]:
+    """
+    Yield .py files under path in os.walk order.
     """
-    results = []
-    skip_dirs = skip_dirs or ["venv", ".venv", "__pycache__", ".git"]
     if os.path.isfile(path):
         if path.endswith(".py"):
-            results.append(parse_file(path))
-        return results
+            yield path
+        return
 
     for root, dirs, files in os.walk(path):
         # filter skip dirs
         dirs[:] = [d for d in dirs if d not in skip_dirs]
         for fname in files:
             if fname.endswith(".py"):
-                fpath = os.path.join(root, fname)
-                results.append(parse_file(fpath))
-    return results
+                yield os.path.join(root, fname)
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _parse_chunk(
+    file_parser: Callable[[str, Optional[bytes]], Dict[str, Any]], files: List[str], sources: List[Optional[bytes]]
+) -> List[Dict[str, Any]]:
+    return [file_parser(f, src) for f, src in zip(files, sources)]
+
+
+def _chunk_misses(files: List[str], lookups: List[Any]) -> Tuple[List[str], List[Optional[bytes]]]:
+    miss_files, miss_sources = [], []
+    for fpath, lookup in zip(files, lookups):
+        if lookup is None:
+            miss_files.append(fpath)
+            miss_sources.append(None)
+        elif lookup.result is None:
+            miss_files.append(fpath)
+            miss_sources.append(lookup.source)
+    return miss_files, miss_sources
+
+
+def _merge_chunk(
+    files: List[str], lookups: List[Any], parsed: List[Dict[str, Any]], cache: Optional["ParseCache"]
+) -> Iterator[Dict[str, Any]]:
+    parsed_iter = iter(parsed)
+    for fpath, lookup in zip(files, lookups):
+        if lookup is not None and lookup.result is not None:
+            yield lookup.result
+            continue
+        data = next(parsed_iter)
+        if cache is not None:
+            cache.store(fpath, lookup, data)
+        yield data
+
+
+def iter_parse_path(
+    path: str,
+    recursive: bool = True,
+    skip_dirs: Optional[List[str]] = None,
+    jobs: int = 1,
+    cache: Optional["ParseCache"] = None,
+    file_parser: Callable[[str, Optional[bytes]], Dict[str, Any]] = parse_file,
+    coverage_only: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse all .py files found at path, yielding each file's metadata as soon
+    as it is ready, in the same order as a sequential scan.
+
+    jobs > 1 parses chunks of files in a process pool (jobs <= 0 uses every
+    core) with a bounded number of chunks in flight, so memory stays flat
+    however large the tree is. With a cache, only files missing from it are
+    parsed.
+
+    file_parser replaces parse_file for each file (e.g.
+    core.validator.validator.review_file); it must be a module-level function
+    so it can run in pool workers, and a cache should use its own namespace.
+
+    coverage_only uses core.parser.coverage_scan.scan_file_coverage instead:
+    records only carry what compute_coverage needs, at a fraction of the
+    cost of a full parse.
+    """
+    if coverage_only:
+        file_parser = scan_file_coverage
+    skip_dirs = skip_dirs or ["venv", ".venv", "__pycache__", ".git"]
+    workers = jobs if jobs > 0 else (os.cpu_count() or 1)
+    chunks = _batched(_iter_python_files(path, skip_dirs), _CHUNK_SIZE if workers > 1 else 1)
+
+    with ExitStack() as stack:
+        if cache is not None:
+            stack.callback(cache.flush)
+        pool = None
+        pending: Deque[Any] = deque()
+        for files in chunks:
+            lookups = [cache.lookup(f) for f in files] if cache is not None else [None] * len(files)
+            miss_files, miss_sources = _chunk_misses(files, lookups)
+
+            if workers <= 1 or not miss_files:
+                parsed = _parse_chunk(file_parser, miss_files, miss_sources)
+                pending.append((files, lookups, parsed, None))
+            else:
+                if pool is None:
+                    pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                pending.append((files, lookups, None, pool.submit(_parse_chunk, file_parser, miss_files, miss_sources)))
+
+            while pending and (pending[0][3] is None or len(pending) >= workers * _CHUNKS_PER_WORKER):
+                files, lookups, parsed, future = pending.popleft()
+                yield from _merge_chunk(files, lookups, parsed if future is None else future.result(), cache)
+
+        while pending:
+            files, lookups, parsed, future = pending.popleft()
+            yield from _merge_chunk(files, lookups, parsed if future is None else future.result(), cache)
+
+
+def parse_path(
+    path: str,
+    recursive: bool = True,
+    skip_dirs: Optional[List[str]] = None,
+    jobs: int = 1,
+    cache: Optional["ParseCache"] = None,
+    file_parser: Callable[[str, Optional[bytes]], Dict[str, Any]] = parse_file,
+    coverage_only: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Parse all .py files found at path. If path is a file, parse that file.
+    Returns list of file metadata dicts.
+
+    See iter_parse_path for jobs, cache, file_parser and coverage_only.
+    """
+    return list(
+        iter_parse_path(
+            path,
+            recursive=recursive,
+            skip_dirs=skip_dirs,
+            jobs=jobs,
+            cache=cache,
+            file_parser=file_parser,
+            coverage_only=coverage_only,
+        )
+    )
@@ -0,0 +1,337 @@
+"""
+core.parser.records
+
+Compact record types for parser output.
+
+FunctionInfo, ArgInfo and ClassInfo store their fields in __slots__ instead
+of a per-record dict, and the short strings that repeat across a codebase
+(annotations, defaults, decorators, raised exceptions) are interned. They
+behave like the dicts the parser used to return (fn["name"], fn.get(...),
+"key" in fn, fn["file_path"] = ...) so existing callers keep working, and
+to_dict() gives the plain form for JSON.
+
+Expression fields (annotations, defaults, returns, decorators, raises,
+bases) may hold a LazyExpr: the expression's source text, normalized with
+ast.unparse only when the field is first read.
+"""
+
+import ast
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+# Marks a LazyExpr kept unresolved in to_dict(resolve=False) output.
+_LAZY_KEY = "__expr__"
+
+
+def intern_str(value: Optional[str]) -> Optional[str]:
+    """Return the interned copy of value (None passes through)."""
+    return sys.intern(value) if value is not None else None
+
+
+class LazyExpr:
+    """
+    Source text of an expression, rendered like ast.unparse on first read.
+    """
+
+    __slots__ = ("segment",)
+
+    def __init__(self, segment: str):
+        self.segment = segment
+
+    def resolve(self) -> str:
+        try:
+            # parenthesized so expressions that span lines (or bare walrus
+            # decorators) parse the same as they did inside the original code
+            return intern_str(ast.unparse(ast.parse(f"({self.segment})", mode="eval").body))
+        except (SyntaxError, ValueError):
+            return intern_str(self.segment)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, LazyExpr) and other.segment == self.segment
+
+    def __hash__(self) -> int:
+        return hash(self.segment)
+
+    def __repr__(self) -> str:
+        return f"LazyExpr({self.segment!r})"
+
+
+def _resolve(value: Any) -> Any:
+    return value.resolve() if isinstance(value, LazyExpr) else value
+
+
+def _store(value: Any) -> Any:
+    # accepts str / None / LazyExpr, or the unresolved JSON form
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict) and _LAZY_KEY in value:
+        return LazyExpr(value[_LAZY_KEY])
+    return value
+
+
+def _dump(value: Any, resolve: bool) -> Any:
+    if isinstance(value, LazyExpr):
+        return value.resolve() if resolve else {_LAZY_KEY: value.segment}
+    return value
+
+
+def _lazy_field(slot: str) -> property:
+    def fget(self):
+        value = getattr(self, slot)
+        if isinstance(value, LazyExpr):
+            value = value.resolve()
+            setattr(self, slot, value)
+        return value
+
+    def fset(self, value):
+        setattr(self, slot, _store(value))
+
+    return property(fget, fset)
+
+
+def _lazy_list_field(slot: str, unique: bool = False) -> property:
+    def fget(self):
+        value = getattr(self, slot)
+        if value and any(isinstance(v, LazyExpr) for v in value):
+            value = [_resolve(v) for v in value]
+            if unique:
+                value = list(set(value))
+            setattr(self, slot, value)
+        return value
+
+    def fset(self, value):
+        setattr(self, slot, [_store(v) for v in value])
+
+    return property(fget, fset)
+
+
+class _Record(Mapping):
+    """
+    Read/write dict-style access over __slots__ fields.
+
+    Keys outside _fields (e.g. "file_path" added by the dashboard or
+    "generated_docstring" added by the CLI) go to a lazily created dict.
+    """
+
+    __slots__ = ("_extra",)
+    _fields: tuple = ()
+    # fields backed by a "_<field>" slot that may hold LazyExpr values
+    _lazy: frozenset = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._fields:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._fields
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self._fields) + (len(self._extra) if self._extra is not None else 0)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def _raw(self, field: str) -> Any:
+        # field value without resolving LazyExpr
+        return getattr(self, "_" + field, None) if field in self._lazy else getattr(self, field)
+
+    def to_dict(self, resolve: bool = True) -> Dict[str, Any]:
+        """
+        Return a plain (JSON-serializable) dict, nested records included.
+
+        resolve=False keeps unread expressions as source text markers, for
+        storage that is loaded back with from_dict (the parse cache).
+        """
+        data = {}
+        for f in self._fields:
+            value = getattr(self, f) if resolve else self._raw(f)
+            if isinstance(value, list):
+                value = [v.to_dict(resolve) if isinstance(v, _Record) else _dump(v, resolve) for v in value]
+            else:
+                value = _dump(value, resolve)
+            data[f] = value
+        if self._extra is not None:
+            data.update(self._extra)
+        return data
+
+    @classmethod
+    def _from_values(cls, data: Dict[str, Any], **overrides: Any) -> "_Record":
+        values = {f: data[f] for f in cls._fields}
+        values.update(overrides)
+        record = cls(**values)
+        for key in data.keys() - set(cls._fields):
+            record[key] = data[key]
+        return record
+
+
+class ArgInfo(_Record):
+    """One positional argument of a parsed function."""
+
+    __slots__ = ("name", "_annotation", "_default")
+    _fields = ("name", "annotation", "default")
+    _lazy = frozenset(("annotation", "default"))
+
+    annotation = _lazy_field("_annotation")
+    default = _lazy_field("_default")
+
+    def __init__(self, name: str, annotation: Any = None, default: Any = None):
+        self._extra = None
+        self.name = name
+        self.annotation = annotation
+        self.default = default
+
+
+class FunctionInfo(_Record):
+    """Metadata for one parsed function or method."""
+
+    __slots__ = (
+        "name",
+        "args",
+        "_returns",
+        "_decorators",
+        "has_docstring",
+        "docstring",
+        "start_line",
+        "end_line",
+        "complexity",
+        "nesting_depth",
+        "_raises",
+        "yields",
+        "indent",
+        "body_shape",
+    )
+    _fields = (
+        "name",
+        "args",
+        "returns",
+        "decorators",
+        "has_docstring",
+        "docstring",
+        "start_line",
+        "end_line",
+        "complexity",
+        "nesting_depth",
+        "raises",
+        "yields",
+        "indent",
+        "body_shape",
+    )
+    _lazy = frozenset(("returns", "decorators", "raises"))
+
+    returns = _lazy_field("_returns")
+    decorators = _lazy_list_field("_decorators")
+    # deduplicated once every raise expression has been rendered
+    raises = _lazy_list_field("_raises", unique=True)
+
+    def __init__(
+        self,
+        name: str,
+        args: List[ArgInfo],
+        returns: Any,
+        decorators: List[Any],
+        has_docstring: bool,
+        docstring: Optional[str],
+        start_line: Optional[int],
+        end_line: Optional[int],
+        complexity: int,
+        nesting_depth: int,
+        raises: List[Any],
+        yields: bool,
+        indent: int,
+        body_shape: Optional[Dict[str, Any]] = None,
+    ):
+        self._extra = None
+        self.name = name
+        self.args = args
+        self.returns = returns
+        self.decorators = decorators
+        self.has_docstring = has_docstring
+        self.docstring = docstring
+        self.start_line = start_line
+        self.end_line = end_line
+        self.complexity = complexity
+        self.nesting_depth = nesting_depth
+        self.raises = raises
+        self.yields = yields
+        self.indent = indent
+        # small-body classification used by the heuristic docstring synthesizer
+        self.body_shape = body_shape
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FunctionInfo":
+        return cls._from_values(data, args=[ArgInfo(**a) for a in data["args"]])
+
+
+class ClassInfo(_Record):
+    """Metadata for one parsed class; methods are the module's FunctionInfo records."""
+
+    __slots__ = ("name", "_bases", "has_docstring", "docstring", "start_line", "end_line", "methods")
+    _fields = ("name", "bases", "has_docstring", "docstring", "start_line", "end_line", "methods")
+    _lazy = frozenset(("bases",))
+
+    bases = _lazy_list_field("_bases")
+
+    def __init__(
+        self,
+        name: str,
+        bases: List[Any],
+        has_docstring: bool,
+        docstring: Optional[str],
+        start_line: Optional[int],
+        end_line: Optional[int],
+        methods: List[Any],
+    ):
+        self._extra = None
+        self.name = name
+        self.bases = bases
+        self.has_docstring = has_docstring
+        self.docstring = docstring
+        self.start_line = start_line
+        self.end_line = end_line
+        self.methods = methods
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ClassInfo":
+        return cls._from_values(data, methods=[function_from_dict(m) for m in data["methods"]])
+
+
+def function_from_dict(data: Dict[str, Any]) -> Any:
+    """Rebuild a FunctionInfo from to_dict() output; error, empty and coverage-only records stay dicts."""
+    if "parse_error" in data or "args" not in data:
+        return data
+    return FunctionInfo.from_dict(data)
+
+
+def class_from_dict(data: Dict[str, Any]) -> Any:
+    """Rebuild a ClassInfo from to_dict() output; error and coverage-only records stay dicts."""
+    if "parse_error" in data or "methods" not in data:
+        return data
+    return ClassInfo.from_dict(data)
+
+
+def to_jsonable(obj: Any) -> Dict[str, Any]:
+    """``default=`` hook for json.dump(s) so records serialize as dicts."""
+    if isinstance(obj, _Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_jsonable_lazy(obj: Any) -> Dict[str, Any]:
+    """Like to_jsonable, but leaves unread expressions unrendered."""
+    if isinstance(obj, _Record):
+        return obj.to_dict(resolve=False)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,75 @@
+"""
+core.parser.source_unit
+
+One source file read, decoded and parsed once, then shared by the parser,
+the docstring validator and the complexity / maintainability metrics.
+"""
+
+import ast
+import re
+from typing import List, Optional
+
+_NEWLINE = re.compile("\n")
+
+
+def decode_source(raw: bytes) -> str:
+    """Decode file bytes the way reading the file in text mode would (universal newlines)."""
+    return raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+class SourceUnit:
+    """
+    Decoded source of one file with its AST and line-offset table.
+
+    The AST and the offset table are built on first use and then reused by
+    every consumer, so a file is read and parsed at most once per scan.
+    """
+
+    __slots__ = ("path", "text", "_tree", "_line_offsets", "_ascii")
+
+    def __init__(self, path: str, text: str):
+        self.path = path
+        self.text = text
+        self._tree: Optional[ast.Module] = None
+        self._line_offsets: Optional[List[int]] = None
+        self._ascii = text.isascii()
+
+    @classmethod
+    def load(cls, path: str, source: Optional[bytes] = None) -> "SourceUnit":
+        """
+        Build a unit from raw bytes already read by the caller, or read path.
+
+        Raises OSError / UnicodeDecodeError like opening the file would.
+        """
+        if source is None:
+            with open(path, "rb") as fh:
+                source = fh.read()
+        return cls(path, decode_source(source))
+
+    @property
+    def tree(self) -> ast.Module:
+        """The module AST (raises SyntaxError for invalid source)."""
+        if self._tree is None:
+            self._tree = ast.parse(self.text, filename=self.path)
+        return self._tree
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Character offset in text where each line (1-based lineno - 1) starts."""
+        if self._line_offsets is None:
+            self._line_offsets = [0] + [m.end() for m in _NEWLINE.finditer(self.text)]
+        return self._line_offsets
+
+    def offset(self, lineno: int, col_offset: int) -> int:
+        """Convert an AST position (UTF-8 byte column) to an offset in text."""
+        start = self.line_offsets[lineno - 1]
+        if self._ascii:
+            return start + col_offset
+        line = self.text[start:start + col_offset]
+        return start + len(line.encode()[:col_offset].decode())
+
+    def segment(self, node: ast.AST) -> str:
+        """Source text spanned by node."""
+        start = self.offset(node.lineno, node.col_offset)
+        end = self.offset(node.end_lineno, node.end_col_offset)
+        return self.text[start:end]
@@ -3,68 +3,107 @@ Compute docstring coverage and write report to JSON.
 """
 
 import json
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable
 
 
-def compute_coverage(per_file_results: List[Dict[str, Any]], threshold: int = 90) -> Dict[str, Any]:
+class _CoverageTotals:
     """
-    Compute docstring coverage with threshold checking.
-    
-    Args:
-        per_file_results: List from python_parser.parse_path
-        threshold: Minimum coverage percentage required (default: 90)
-    
-    Returns:
-        Coverage dict with per-file and aggregate stats including threshold check
+    Running coverage totals, updated one file at a time.
     """
-    report = {"files": [], "aggregate": {}}
-    total_funcs = 0
-    total_with_doc = 0
-    total_generated = 0
-    total_files = len(per_file_results)
-    parsing_errors_total = 0
-
-    for f in per_file_results:
+
+    def __init__(self):
+        self.total_files = 0
+        self.total_funcs = 0
+        self.total_with_doc = 0
+        self.total_generated = 0
+        self.parsing_errors_total = 0
+
+    def add(self, f: Dict[str, Any]) -> Dict[str, Any]:
+        """Fold one parsed file into the totals and return its report entry."""
         funcs = f.get("functions", [])
         file_total = len(funcs)
         file_with_doc = sum(1 for fn in funcs if fn.get("has_docstring"))
         file_generated = sum(1 for fn in funcs if fn.get("generated_docstring"))
-        
-        total_funcs += file_total
-        total_with_doc += file_with_doc + file_generated
-        total_generated += file_generated
-        parsing_errors_total += len(f.get("parsing_errors", []))
-        
+
+        self.total_files += 1
+        self.total_funcs += file_total
+        self.total_with_doc += file_with_doc + file_generated
+        self.total_generated += file_generated
+        self.parsing_errors_total += len(f.get("parsing_errors", []))
+
         coverage = 0.0
         if file_total:
             coverage = (file_with_doc + file_generated) / file_total * 100.0
-        
-        report["files"].append({
+
+        return {
             "file_path": f.get("file_path"),
             "total_functions": file_total,
             "functions_with_docstring": file_with_doc,
             "generated_docstrings": file_generated,
             "coverage_percent": round(coverage, 2),
             "parsing_errors": f.get("parsing_errors", []),
-        })
-
-    aggregate_coverage = 0.0
-    if total_funcs:
-        aggregate_coverage = total_with_doc / total_funcs * 100.0
-
-    report["aggregate"] = {
-        "total_files": total_files,
-        "total_functions": total_funcs,
-        "documented": total_with_doc,
-        "generated_docstrings": total_generated,
-        "coverage_percent": round(aggregate_coverage, 2),
-        "meets_threshold": aggregate_coverage >= threshold,
-        "parsing_errors_total": parsing_errors_total,
-    }
+        }
+
+    def aggregate(self, threshold: int) -> Dict[str, Any]:
+        aggregate_coverage = 0.0
+        if self.total_funcs:
+            aggregate_coverage = self.total_with_doc / self.total_funcs * 100.0
+
+        return {
+            "total_files": self.total_files,
+            "total_functions": self.total_funcs,
+            "documented": self.total_with_doc,
+            "generated_docstrings": self.total_generated,
+            "coverage_percent": round(aggregate_coverage, 2),
+            "meets_threshold": aggregate_coverage >= threshold,
+            "parsing_errors_total": self.parsing_errors_total,
+        }
+
+
+def compute_coverage(per_file_results: Iterable[Dict[str, Any]], threshold: int = 90) -> Dict[str, Any]:
+    """
+    Compute docstring coverage with threshold checking.
+
+    Args:
+        per_file_results: File records from python_parser.parse_path or
+            iter_parse_path (any iterable; consumed once)
+        threshold: Minimum coverage percentage required (default: 90)
+
+    Returns:
+        Coverage dict with per-file and aggregate stats including threshold check
+    """
+    totals = _CoverageTotals()
+    report = {"files": [totals.add(f) for f in per_file_results], "aggregate": {}}
+    report["aggregate"] = totals.aggregate(threshold)
     return report
 
 
 def write_report(report: Dict[str, Any], path: str) -> None:
     """Write coverage report to JSON file."""
     with open(path, "w", encoding="utf-8") as fh:
-        json.dump(report, fh, indent=2)
\ No newline at end of file
+        json.dump(report, fh, indent=2)
+
+
+def write_report_streaming(
+    per_file_results: Iterable[Dict[str, Any]], path: str, threshold: int = 90
+) -> Dict[str, Any]:
+    """
+    Compute coverage and write the report while file records are consumed.
+
+    Each file entry is written as soon as its record arrives, so neither the
+    records nor the per-file entries are held in memory. The output is the
+    same JSON that write_report(compute_coverage(...)) produces.
+
+    Returns:
+        The aggregate stats dict
+    """
+    totals = _CoverageTotals()
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('{\n  "files": [')
+        for i, f in enumerate(per_file_results):
+            entry = json.dumps(totals.add(f), indent=2).replace("\n", "\n    ")
+            fh.write(("," if i else "") + "\n    " + entry)
+        aggregate = totals.aggregate(threshold)
+        fh.write("\n  ]," if totals.total_files else "],")
+        fh.write('\n  "aggregate": ' + json.dumps(aggregate, indent=2).replace("\n", "\n  ") + "\n}")
+    return aggregate
@@ -1,11 +1,38 @@
+import tokenize
+from typing import Any, Dict, Optional
+
 from pydocstyle import check
-from radon.complexity import cc_visit
-from radon.metrics import mi_visit
+from pydocstyle.checker import ConventionChecker
+from pydocstyle.parser import AllError, ParseError
+from pydocstyle.violations import conventions
+from radon.complexity import cc_visit, cc_visit_ast
+from radon.metrics import h_visit_ast, mi_compute, mi_visit
+from radon.raw import analyze
+from radon.visitors import ComplexityVisitor
+
+from core.parser.python_parser import parse_file, parse_unit
+from core.parser.source_unit import SourceUnit
+
+
+def _check_unit(unit):
+    # same checks and error handling as pydocstyle.check, on the shared source
+    try:
+        for error in ConventionChecker().check_source(unit.text, unit.path):
+            if getattr(error, "code", None) in conventions.pep257:
+                yield error
+    except (AllError, ParseError) as error:
+        yield error
+    except tokenize.TokenError:
+        yield SyntaxError("invalid syntax in file %s" % unit.path)
 
 
 def validate_docstrings(file_path):
+    """
+    file_path: path to check, or a SourceUnit that is already loaded.
+    """
+    errors = _check_unit(file_path) if isinstance(file_path, SourceUnit) else check([file_path])
     violations = []
-    for error in check([file_path]):
+    for error in errors:
         violations.append({
             "code": getattr(error, "code", "PARSE_ERROR"),
             "line": getattr(error, "line", None),
@@ -15,9 +42,57 @@ def validate_docstrings(file_path):
 
 
 def compute_complexity(source):
-    results = cc_visit(source)
+    """
+    source: code string, or a SourceUnit whose AST is reused.
+    """
+    if isinstance(source, SourceUnit):
+        results = cc_visit_ast(source.tree)
+    else:
+        results = cc_visit(source)
     return [{"name": r.name, "complexity": r.complexity, "line": r.lineno} for r in results]
 
 
 def compute_maintainability(source):
-    return round(mi_visit(source, True), 2)
+    """
+    source: code string, or a SourceUnit whose AST is reused.
+    """
+    if not isinstance(source, SourceUnit):
+        return round(mi_visit(source, True), 2)
+    # radon.metrics.mi_parameters(code, count_multi=True) without re-parsing
+    raw = analyze(source.text)
+    comments_lines = raw.comments + raw.multi
+    comments = comments_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+    mi = mi_compute(
+        h_visit_ast(source.tree).total.volume,
+        ComplexityVisitor.from_ast(source.tree).total_complexity,
+        raw.lloc,
+        comments,
+    )
+    return round(mi, 2)
+
+
+def review_file(path: str, source: Optional[bytes] = None) -> Dict[str, Any]:
+    """
+    Parse, validate and measure one file from a single read and parse.
+
+    Returns the parse_file record plus "docstring_violations",
+    "complexity_details" and "maintainability" (None / [] when the file
+    cannot be parsed).
+    """
+    try:
+        unit = SourceUnit.load(path, source)
+    except Exception:
+        # parse_file records the read / decode error
+        data = parse_file(path, source)
+        data.update({"docstring_violations": [], "complexity_details": [], "maintainability": None})
+        return data
+
+    data = parse_unit(unit)
+    data["docstring_violations"] = validate_docstrings(unit)
+    try:
+        data["complexity_details"] = compute_complexity(unit)
+        data["maintainability"] = compute_maintainability(unit)
+    except SyntaxError:
+        data["complexity_details"] = []
+        data["maintainability"] = None
+    return data
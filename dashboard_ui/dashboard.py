@@ -18,6 +18,8 @@ import io
 import streamlit as st
 import pandas as pd
 
+from core.parser.records import to_jsonable
+
 
 # -------------------------------------------------
 # CONFIG
@@ -59,7 +61,7 @@ def filter_functions(functions, search=None, status=None):
 # EXPORT HELPERS
 # -------------------------------------------------
 def export_json(data):
-    return json.dumps(data, indent=2)
+    return json.dumps(data, indent=2, default=to_jsonable)
 
 
 def export_csv(functions):
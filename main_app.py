@@ -15,15 +15,22 @@ Combined Milestone 1 + Milestone 2 Streamlit App
 import json
 import os
 import difflib
+import time
 import streamlit as st
 import ast
+from contextlib import closing
 
 from core.parser.python_parser import parse_path
-from core.docstring_engine.generator import generate_docstring
+from core.parser.cache import ParseCache
+from core.docstring_engine.clients import ClientRegistry
+from core.docstring_engine.generator import stream_docstrings
+from core.docstring_engine.prefetch import PrefetchQueue, prioritize
+from core.docstring_engine.response_cache import default_response_cache
 from core.validator.validator import (
     validate_docstrings,
     compute_complexity,
-    compute_maintainability
+    compute_maintainability,
+    review_file
 )
 from core.reporter.coverage_reporter import compute_coverage, write_report
 from dashboard_ui.dashboard import render_dashboard
@@ -37,6 +44,33 @@ st.set_page_config(page_title="AI Code Reviewer", layout="wide")
 # -------------------------------------------------
 # Helper functions
 # -------------------------------------------------
+@st.cache_resource
+def llm_clients():
+    """
+    One client registry for every session, so LLM HTTP connections are reused.
+    """
+    return ClientRegistry()
+
+
+# previews generated per page of the selected file; files warmed in the background
+PREVIEW_PAGE_SIZE = 10
+PREFETCH_FILES = 3
+
+
+def session_generation():
+    """
+    This session's generated content (by content key) and prefetch queue.
+    Reruns read previews from the content cache instead of the LLM.
+    """
+    if "docstring_contents" not in st.session_state:
+        st.session_state["docstring_contents"] = {}
+    if "docstring_prefetch" not in st.session_state:
+        st.session_state["docstring_prefetch"] = PrefetchQueue(
+            clients=llm_clients(), memo=st.session_state["docstring_contents"]
+        )
+    return st.session_state["docstring_contents"], st.session_state["docstring_prefetch"]
+
+
 def get_status_badge_by_file(file_path, file_data, selected_style):
     """
     Check ONLY if file has complete docstrings in the selected style.
@@ -156,6 +190,16 @@ def is_docstring_complete(fn, style):
 
 
 
+def get_violations(file_data):
+    """
+    PEP-257 violations collected during the scan (validates on demand for
+    records scanned without them).
+    """
+    if "docstring_violations" in file_data:
+        return file_data["docstring_violations"]
+    return validate_docstrings(file_data["file_path"])
+
+
 def apply_docstring(file_path, fn, generated_docstring):
     """
     Replace existing docstring or insert new one.
@@ -229,13 +273,16 @@ st.sidebar.markdown("---")
 
 scan_path = st.sidebar.text_input("Path to scan", value="examples")
 out_path = st.sidebar.text_input("Output JSON path", value="storage/review_logs.json")
+scan_jobs = st.sidebar.number_input("Parallel jobs", min_value=1, value=os.cpu_count() or 1, step=1)
 
 if st.sidebar.button("Scan"):
     if not os.path.exists(scan_path):
         st.sidebar.error("Path not found")
     else:
         with st.spinner("Parsing files..."):
-            parsed_files = parse_path(scan_path)
+            # parse + PEP-257 validation + metrics from one read per file
+            with ParseCache(namespace="review") as cache:
+                parsed_files = parse_path(scan_path, jobs=int(scan_jobs), cache=cache, file_parser=review_file)
             coverage = compute_coverage(parsed_files)
 
             os.makedirs(os.path.dirname(out_path), exist_ok=True)
@@ -366,15 +413,25 @@ elif menu == "📘 Docstrings":
             else:
                 file_data = next(f for f in parsed_files if f["file_path"] == selected_file)
                 
-                has_changes = False
-
-                for fn in file_data["functions"]:
-                    # Skip if already has valid docstring in selected style
-                    if is_docstring_complete(fn, style):
-                        continue
-                    
-                    has_changes = True
-                    
+                # Skip functions that already have a valid docstring in the selected style
+                pending = [fn for fn in file_data["functions"] if not is_docstring_complete(fn, style)]
+                has_changes = bool(pending)
+                session_contents, prefetch = session_generation()
+
+                # only the page on screen is generated now; the rest is prefetched
+                pages = max((len(pending) + PREVIEW_PAGE_SIZE - 1) // PREVIEW_PAGE_SIZE, 1)
+                page = 1
+                if pages > 1:
+                    page = int(st.number_input(
+                        f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"page_{selected_file}_{style}"
+                    ))
+                start = (page - 1) * PREVIEW_PAGE_SIZE
+                visible = pending[start:start + PREVIEW_PAGE_SIZE]
+                offscreen = pending[:start] + pending[start + PREVIEW_PAGE_SIZE:]
+
+                # cards are laid out first and filled in as each preview arrives
+                cards = []
+                for fn in visible:
                     st.markdown(f"### Function: `{fn['name']}`")
 
                     # Get before/after
@@ -385,8 +442,6 @@ elif menu == "📘 Docstrings":
                         before = f'"""\n{existing}\n"""'
                     else:
                         before = "❌ No existing docstring"
-                    
-                    after = generate_docstring(fn, style)
 
                     c1, c2 = st.columns(2, gap="small")
                     with c1:
@@ -394,32 +449,87 @@ elif menu == "📘 Docstrings":
                         st.code(before, language="python")
                     with c2:
                         st.caption("After (Preview)")
-                        st.code(after, language="python")
-
-                        a1, a2 = st.columns(2)
-                        with a1:
-                            if st.button("✅ Accept", key=f"accept_{fn['name']}_{selected_file}_{style}"):
-                                apply_docstring(selected_file, fn, after)
-
-                                # 🔄 RE-PARSE + RE-SCAN AFTER CHANGE
-                                updated_files = parse_path(scan_path)
-                                updated_coverage = compute_coverage(updated_files)
-                                
-                                st.session_state["parsed_files"] = updated_files
-                                st.session_state["coverage"] = updated_coverage
-                                
-                                st.success("Docstring applied!")
-                                st.rerun()
-                        with a2:
-                            st.button("❌ Reject", key=f"reject_{fn['name']}_{selected_file}_{style}")
-
-                    st.caption("Diff")
-                    st.code(generate_diff(before, after), language="diff")
+                        after_slot = st.empty()
+                        after_slot.caption("⏳ Waiting for the model...")
+                    diff_slot = st.empty()
                     st.markdown("---")
+                    cards.append((fn, before, after_slot, diff_slot))
+
+                progress = st.progress(0.0, text=f"Generating {len(visible)} docstrings...") if visible else None
+                done = 0
+                last_text = {}
+                # leaving this block (finished, or the rerun after a file/style
+                # click interrupts the script) cancels requests still running
+                with closing(stream_docstrings(visible, style, clients=llm_clients(), memo=session_contents)) as events:
+                    for kind, i, value in events:
+                        if kind == "idle":
+                            progress.progress(done / len(visible), text=f"Generated {done}/{len(visible)} docstrings...")
+                            continue
+                        fn, before, after_slot, diff_slot = cards[i]
+                        if kind == "text":
+                            # raw JSON as it streams, at most ten updates a second per card
+                            if time.monotonic() - last_text.get(i, 0.0) >= 0.1:
+                                after_slot.code(value, language="json")
+                                last_text[i] = time.monotonic()
+                            continue
+
+                        done += 1
+                        progress.progress(done / len(visible), text=f"Generated {done}/{len(visible)} docstrings...")
+                        after = value
+                        if isinstance(after, Exception):
+                            after_slot.error(f"Docstring generation failed: {after}")
+                            continue
+
+                        with after_slot.container():
+                            st.code(after, language="python")
+
+                            a1, a2 = st.columns(2)
+                            with a1:
+                                if st.button("✅ Accept", key=f"accept_{fn['name']}_{selected_file}_{style}"):
+                                    apply_docstring(selected_file, fn, after)
+
+                                    # 🔄 RE-PARSE + RE-SCAN AFTER CHANGE
+                                    with ParseCache(namespace="review") as cache:
+                                        updated_files = parse_path(
+                                            scan_path, jobs=int(scan_jobs), cache=cache, file_parser=review_file
+                                        )
+                                    updated_coverage = compute_coverage(updated_files)
+                                    
+                                    st.session_state["parsed_files"] = updated_files
+                                    st.session_state["coverage"] = updated_coverage
+                                    
+                                    st.success("Docstring applied!")
+                                    st.rerun()
+                            with a2:
+                                st.button("❌ Reject", key=f"reject_{fn['name']}_{selected_file}_{style}")
+
+                        with diff_slot.container():
+                            st.caption("Diff")
+                            st.code(generate_diff(before, after), language="diff")
+                if progress is not None:
+                    progress.empty()
+
+                # warm the rest of this file, then the files missing the most docstrings
+                missing_by_file = {
+                    f["file_path"]: [fn for fn in f.get("functions", []) if not is_docstring_complete(fn, style)]
+                    for f in parsed_files
+                    if f["file_path"] != selected_file
+                }
+                missing_by_file[selected_file] = offscreen
+                prefetch.schedule(prioritize(missing_by_file, [selected_file], PREFETCH_FILES))
                 
                 if not has_changes:
                     st.success(f"✅ All docstrings are complete and valid in {style.upper()} style!")
 
+                llm_cache = default_response_cache().stats()
+                warming = prefetch.stats()
+                st.caption(
+                    f"LLM cache: {llm_cache['hits']} hits / {llm_cache['misses']} misses "
+                    f"({llm_cache['entries']} stored responses) | "
+                    f"Session: {len(session_contents)} previews cached, "
+                    f"{warming['warmed_files']} files prefetched, {warming['queued']} queued"
+                )
+
 
 # -------------------------------------------------
 # VALIDATION
@@ -435,7 +545,7 @@ elif menu == "📊 Validation":
         
         for f in parsed_files:
             file_path = f["file_path"]
-            violations = validate_docstrings(file_path)
+            violations = get_violations(f)
             
             # PEP-257 specific badge
             pep_status = "🟢 OK" if not violations else "🔴 Fix"
@@ -450,7 +560,7 @@ elif menu == "📊 Validation":
         
         selected_file = st.session_state.get("validation_file")
         if selected_file:
-            violations = validate_docstrings(selected_file)
+            violations = get_violations(next(f for f in parsed_files if f["file_path"] == selected_file))
             
             st.bar_chart({
                 "Compliant": 1 if not violations else 0,
@@ -474,11 +584,17 @@ elif menu == "📐 Metrics":
         file_paths = [f["file_path"] for f in parsed_files]
         selected_file = st.selectbox("Select File", file_paths)
 
-        with open(selected_file, "r", encoding="utf-8") as f:
-            src = f.read()
+        file_data = next(f for f in parsed_files if f["file_path"] == selected_file)
+
+        if "maintainability" in file_data:
+            st.metric("Maintainability Index", file_data["maintainability"])
+            st.json(file_data["complexity_details"])
+        else:
+            with open(selected_file, "r", encoding="utf-8") as f:
+                src = f.read()
 
-        st.metric("Maintainability Index", compute_maintainability(src))
-        st.json(compute_complexity(src))
+            st.metric("Maintainability Index", compute_maintainability(src))
+            st.json(compute_complexity(src))
 
 
 
@@ -0,0 +1,62 @@
+# tests/conftest.py
+"""Shared fixtures for the LLM tests."""
+
+import inspect
+
+import pytest
+
+from core.docstring_engine import clients, defaults, generator, rate_limit, response_cache
+
+
+@pytest.fixture
+def llm_state(monkeypatch, tmp_path):
+    """
+    Fresh process-wide LLM state: every default (client registry, router,
+    metrics, scheduler, synthesizer, ...) rebuilt on first use, an empty
+    generator memo, no rate limit and a response cache in tmp_path. Reset
+    again afterwards so nothing leaks into the next test.
+    """
+    defaults.reset_all()
+    generator.clear_memo()
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    rate_limit.default_rate_limiter.set(rate_limit.RateLimiter(10**9, 10**9))
+    response_cache.default_response_cache.set(response_cache.LLMResponseCache(str(tmp_path / "llm.sqlite")))
+    yield
+    defaults.reset_all()
+    generator.clear_memo()
+
+
+@pytest.fixture
+def fake_chat(monkeypatch, llm_state):
+    """
+    Factory installing a ChatGroq stand-in on top of llm_state.
+
+    fake_chat(reply, usage=None) answers every prompt with reply(prompt)
+    (a plain or async function returning the response text, or raising) and
+    returns the list of prompts sent. usage becomes each response's
+    usage_metadata.
+    """
+
+    def install(reply, usage=None):
+        prompts = []
+
+        def respond(text):
+            return type("Response", (), {"content": text, "usage_metadata": usage})()
+
+        class FakeChat:
+            def __init__(self, **kwargs):
+                pass
+
+            def invoke(self, messages):
+                prompts.append(messages[0].content)
+                return respond(reply(messages[0].content))
+
+            async def ainvoke(self, messages):
+                prompts.append(messages[0].content)
+                text = reply(messages[0].content)
+                return respond(await text if inspect.isawaitable(text) else text)
+
+        monkeypatch.setattr(clients, "ChatGroq", FakeChat)
+        return prompts
+
+    return install
@@ -0,0 +1,39 @@
+# tests/test_benchmarks.py
+"""Tests for the benchmark corpus generator and runner."""
+
+import ast
+
+from benchmarks.corpus import CorpusConfig, generate_corpus
+from benchmarks.run import run
+
+
+def test_corpus_is_reproducible(tmp_path):
+    """Test that the same config and seed produce identical, valid files."""
+    config = CorpusConfig(files=6, files_per_package=2, nesting_depth=6)
+    first = generate_corpus(str(tmp_path / "a"), config)
+    second = generate_corpus(str(tmp_path / "b"), config)
+
+    assert len(first) == 6
+    for a, b in zip(first, second):
+        source = open(a, encoding="utf-8").read()
+        assert source == open(b, encoding="utf-8").read()
+        ast.parse(source)
+
+
+def test_run_reports_every_stage():
+    """Test that a small benchmark run returns timings and peak memory per stage."""
+    result = run(CorpusConfig(files=2, functions_per_file=3), repeat=1)
+
+    assert result["corpus"]["total_files"] >= 2
+    assert set(result["stages"]) == {
+        "parse_path",
+        "parse_path_coverage_only",
+        "compute_coverage",
+        "validate_docstrings",
+        "compute_complexity",
+        "format_docstrings",
+    }
+    for stage in result["stages"].values():
+        assert stage["seconds_min"] >= 0
+        assert stage["peak_memory_bytes"] >= 0
+    assert result["records_memory"]["functions"] == result["corpus"]["total_functions"]
@@ -29,4 +29,66 @@ def test_empty_input_handling():
     """Test coverage computation with empty input."""
     report = compute_coverage([])
     assert report["aggregate"]["total_functions"] == 0
-    assert report["aggregate"]["coverage_percent"] == 0
\ No newline at end of file
+    assert report["aggregate"]["coverage_percent"] == 0
+
+
+def test_coverage_accepts_iterator():
+    """Test that coverage can be computed from a streaming parse."""
+    from core.parser.python_parser import iter_parse_path
+
+    assert compute_coverage(iter_parse_path("examples")) == compute_coverage(parse_path("examples"))
+
+
+def test_streaming_report_matches_write_report(tmp_path):
+    """Test that the streaming writer produces the same JSON as write_report."""
+    from core.parser.python_parser import iter_parse_path
+    from core.reporter.coverage_reporter import write_report, write_report_streaming
+
+    expected = tmp_path / "expected.json"
+    streamed = tmp_path / "streamed.json"
+    write_report(compute_coverage(parse_path("examples")), str(expected))
+    aggregate = write_report_streaming(iter_parse_path("examples"), str(streamed))
+
+    assert streamed.read_text(encoding="utf-8") == expected.read_text(encoding="utf-8")
+    assert aggregate == compute_coverage(parse_path("examples"))["aggregate"]
+
+    write_report(compute_coverage([]), str(expected))
+    write_report_streaming([], str(streamed))
+    assert streamed.read_text(encoding="utf-8") == expected.read_text(encoding="utf-8")
+
+
+def test_coverage_only_scan_matches_full_parse(tmp_path):
+    """Test that the coverage-only scan reports the same coverage as a full parse."""
+    module = tmp_path / "tricky.py"
+    module.write_text(
+        'TEXT = """\n'
+        'def not_a_function():\n'
+        '    pass\n'
+        '"""\n'
+        "\n"
+        "class Documented:  # comment\n"
+        '    r"""Raw docstring."""\n'
+        "\n"
+        "    async def method(self, key=lambda x: x[0],\n"
+        "                     flag: dict = {}) -> 'Documented':\n"
+        "        # leading comment\n"
+        "        (\n"
+        '            "implicitly "\n'
+        '            "joined"\n'
+        "        )\n"
+        "\n"
+        '    def expression(self): "doc" + "more"\n'
+        '    def fstring(self): f"{self}"\n'
+        "    def blank(self):\n"
+        '        """   """\n'
+        '    def one_liner(self): "doc"; return 1\n'
+        "\n"
+        "def undocumented(): ...\n",
+        encoding="utf-8",
+    )
+
+    for path in ("examples", str(tmp_path)):
+        assert compute_coverage(parse_path(path, coverage_only=True)) == compute_coverage(parse_path(path))
+    scanned = parse_path(str(module), coverage_only=True)[0]
+    assert [c["has_docstring"] for c in scanned["classes"]] == [True]
+    assert [f["has_docstring"] for f in scanned["functions"]] == [True, False, False, False, True, False]
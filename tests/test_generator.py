@@ -53,4 +53,284 @@ def test_invalid_style_raises_error():
         generate_docstring(fn, style="invalid_style")
         assert False, "Should have raised ValueError"
     except ValueError as e:
-        assert "Unknown style" in str(e)
\ No newline at end of file
+        assert "Unknown style" in str(e)
+
+
+def test_generate_docstrings_async_bounded_and_ordered(fake_chat):
+    """Test concurrent generation: input order kept, concurrency bounded, failures isolated."""
+    import asyncio
+    import json
+
+    from core.docstring_engine.generator import generate_docstrings
+
+    state = {"in_flight": 0, "peak": 0}
+
+    async def reply(prompt):
+        name = prompt.split("Function name: ")[1].split("\n")[0]
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        # later functions finish first
+        await asyncio.sleep(0.01 * (10 - int(name[2:])))
+        state["in_flight"] -= 1
+        if name == "fn3":
+            raise RuntimeError("rate limited")
+        return json.dumps({"summary": f"Run {name}."})
+
+    fake_chat(reply)
+
+    functions = [{"name": f"fn{i}", "args": [], "returns": None} for i in range(8)]
+    results = generate_docstrings(functions, "google", max_concurrency=3)
+
+    assert state["peak"] == 3
+    assert isinstance(results[3], RuntimeError)
+    for i, doc in enumerate(results):
+        if i != 3:
+            assert f"Run fn{i}." in doc
+
+
+def test_style_switch_reuses_generated_content(fake_chat):
+    """Test that switching styles only re-runs the formatters."""
+    import json
+
+    from core.docstring_engine.generator import generate_docstrings
+
+    calls = fake_chat(lambda prompt: json.dumps({"summary": "Scale the input.", "args": {"x": "Input."}}))
+
+    functions = [{"name": f"scale_{i}", "args": [{"name": "x", "annotation": "float"}], "returns": "float"} for i in range(50)]
+    google = generate_docstrings(functions, "google")
+    numpy = generate_docstrings(functions, "numpy")
+    rest = generate_docstrings(functions, "rest")
+
+    assert len(calls) == 50
+    assert "Args:" in google[0] and "Parameters" in numpy[0] and ":param x: Input." in rest[0]
+    assert generate_docstring(functions[0], style="numpy") == numpy[0]
+    assert len(calls) == 50
+
+
+def test_trivial_functions_are_synthesized_without_llm(tmp_path):
+    """Test rule-based content for trivial functions and the confidence threshold."""
+    from core.docstring_engine.heuristics import HeuristicSynthesizer
+    from core.parser.python_parser import parse_file
+
+    module = tmp_path / "point.py"
+    module.write_text(
+        "class Point:\n"
+        "    def __init__(self, x, y):\n"
+        "        self.x = x\n"
+        "        self._y = y\n"
+        "\n"
+        "    @property\n"
+        "    def y(self):\n"
+        "        return self._y\n"
+        "\n"
+        "    @y.setter\n"
+        "    def y(self, value):\n"
+        "        self._y = value\n"
+        "\n"
+        "    def __repr__(self):\n"
+        "        return f'Point({self.x}, {self._y})'\n"
+        "\n"
+        "    def distance(self, other):\n"
+        "        return math.hypot(other)\n"
+        "\n"
+        "    def clamp(self, low, high):\n"
+        "        if self.x < low:\n"
+        "            return low\n"
+        "        return min(self.x, high)\n",
+        encoding="utf-8",
+    )
+    functions = {fn["name"] + str(fn["start_line"]): fn for fn in parse_file(str(module))["functions"]}
+
+    synthesizer = HeuristicSynthesizer(threshold=0.8)
+    init = synthesizer.content(functions["__init__2"])
+    assert init["summary"] == "Initialize the instance."
+    assert set(init["args"]) == {"self", "x", "y"}
+    assert synthesizer.content(functions["y7"])["summary"] == "Return the y."
+    assert synthesizer.content(functions["y11"])["args"]["value"] == "New y."
+    assert "representation" in synthesizer.content(functions["__repr__14"])["summary"]
+    assert synthesizer.content(functions["distance17"])["summary"] == "Call ``math.hypot`` with the given arguments."
+    assert synthesizer.content(functions["clamp20"]) is None
+    assert synthesizer.stats()["avoided_llm_calls"] == 5
+    assert synthesizer.stats()["fell_through"] == 1
+
+    strict = HeuristicSynthesizer(threshold=0.85)
+    assert strict.content(functions["distance17"]) is None
+    assert strict.content(functions["__init__2"]) is not None
+
+
+def test_functions_with_identical_prompts_share_one_request(fake_chat, tmp_path):
+    """Test that same-signature functions share a request whatever their bodies, and other names do not."""
+    import json
+
+    from core.docstring_engine import scheduler
+    from core.docstring_engine.generator import generate_docstrings
+    from core.parser.python_parser import parse_file
+
+    def reply(prompt):
+        name = prompt.split("Function name: ")[1].split("\n")[0]
+        return json.dumps({"summary": f"Describe {name}."})
+
+    calls = fake_chat(reply)
+
+    (tmp_path / "counts.py").write_text(
+        "def merge(a, b):\n    out = dict(a)\n    for k in b:\n        out[k] = out.get(k, 0) + b[k]\n    return out\n\n"
+        "def merge_max(a, b):\n    out = dict(a)\n    for k in b:\n        out[k] = max(out.get(k, 0), b[k])\n    return out\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "totals.py").write_text(
+        "def merge(a, b):\n    total = list(a)\n    while b:\n        total.append(b.pop())\n    return total\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "vendored.py").write_text(
+        "def merge(a, b):\n    '''Copied.'''\n    out = dict(a)\n    for k in b:\n        out[k] = out.get(k, 0) + b[k]\n    return out\n",
+        encoding="utf-8",
+    )
+    functions = [fn for name in ("counts", "totals", "vendored") for fn in parse_file(str(tmp_path / f"{name}.py"))["functions"]]
+
+    docs = generate_docstrings(functions, "google")
+
+    # one prompt for the three merge(a, b), one for merge_max(a, b)
+    assert len(calls) == 2
+    for fn, doc in zip(functions, docs):
+        assert f"Describe {fn['name']}." in doc
+    assert scheduler.default_scheduler().stats() == {
+        "functions": 4, "unique": 2, "deduplicated": 2, "dedup_ratio": 0.5,
+    }
+
+
+def test_stream_docstrings_streams_text_and_cancels_on_close(monkeypatch, llm_state):
+    """Test streamed previews arrive per function and closing cancels the rest."""
+    import asyncio
+    import json
+    import threading
+    from contextlib import closing
+
+    from langchain_core.messages import AIMessageChunk
+
+    from core.docstring_engine import clients
+    from core.docstring_engine.generator import stream_docstrings
+
+    cancelled = threading.Event()
+
+    class FakeChat:
+        def __init__(self, **kwargs):
+            pass
+
+        async def astream(self, messages):
+            name = messages[0].content.split("Function name: ")[1].split("\n")[0]
+            if name == "slow_stream":
+                try:
+                    await asyncio.sleep(30)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            text = json.dumps({"summary": f"Stream {name}."})
+            for start in range(0, len(text), 8):
+                yield AIMessageChunk(content=text[start:start + 8])
+
+    monkeypatch.setattr(clients, "ChatGroq", FakeChat)
+
+    functions = [{"name": "slow_stream", "args": [], "returns": None}, {"name": "fast_stream", "args": [], "returns": None}]
+    seen = []
+    with closing(stream_docstrings(functions, "google")) as events:
+        for kind, index, value in events:
+            seen.append((kind, index))
+            if kind == "done":
+                assert index == 1 and "Stream fast_stream." in value
+                break
+
+    assert ("text", 1) in seen and seen.index(("text", 1)) < seen.index(("done", 1))
+    assert cancelled.wait(5)
+
+
+def test_prefetch_queue_warms_files_in_priority_order(fake_chat):
+    """Test prefetch ordering and that warmed content is served without the LLM."""
+    import json
+    import time
+
+    from core.docstring_engine.generator import generate_contents
+    from core.docstring_engine.prefetch import PrefetchQueue, prioritize
+
+    calls = []
+
+    def reply(prompt):
+        name = prompt.split("Function name: ")[1].split("\n")[0]
+        calls.append(name)
+        return json.dumps({"summary": f"Warm {name}."})
+
+    fake_chat(reply)
+
+    def fns(prefix, n):
+        return [{"name": f"{prefix}_{i}", "args": [], "returns": None} for i in range(n)]
+
+    pending = {"a.py": fns("warm_a", 1), "b.py": fns("warm_b", 3), "c.py": fns("warm_c", 2), "d.py": []}
+    jobs = prioritize(pending, ["c.py"], limit=2)
+    assert [path for path, _ in jobs] == ["c.py", "b.py"]
+
+    session = {}
+    queue = PrefetchQueue(memo=session)
+    queue.schedule(jobs)
+    deadline = time.monotonic() + 5
+    while queue.stats()["warmed_files"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert queue.stats() == {"queued": 0, "warmed_files": 2, "files_with_failures": 0}
+    assert sorted(calls) == ["warm_b_0", "warm_b_1", "warm_b_2", "warm_c_0", "warm_c_1"]
+    assert len(session) == 5
+    contents = generate_contents(pending["b.py"] + pending["c.py"], memo=session)
+    assert [c["summary"] for c in contents[:1]] == ["Warm warm_b_0."]
+    assert len(calls) == 5
+
+
+def test_synthesized_content_is_not_reused_for_other_bodies(fake_chat, tmp_path):
+    """Test that heuristic content never reaches a same-signature function the heuristics skip."""
+    import json
+
+    from core.docstring_engine.generator import generate_contents, generate_docstrings
+    from core.parser.python_parser import parse_file
+
+    calls = fake_chat(lambda prompt: json.dumps({"summary": "Sum price times count."}))
+
+    (tmp_path / "cached.py").write_text("class Order:\n    def total_due(self):\n        return self._total_due\n", encoding="utf-8")
+    (tmp_path / "computed.py").write_text(
+        "class Order:\n"
+        "    def total_due(self):\n"
+        "        out = 0\n"
+        "        for item in self.items:\n"
+        "            out += item.price * item.count\n"
+        "        return out\n",
+        encoding="utf-8",
+    )
+    cached = parse_file(str(tmp_path / "cached.py"))["functions"]
+    computed = parse_file(str(tmp_path / "computed.py"))["functions"]
+    session = {}
+
+    assert generate_contents(cached, memo=session)[0]["summary"] == "Return the total due."
+    assert session == {} and calls == []
+    assert "Sum price times count." in generate_docstrings(computed)[0]
+    assert len(calls) == 1
+    # the LLM content memoized for the signature does not replace the heuristics either
+    assert "Return the total due." in generate_docstrings(cached)[0]
+
+
+def test_fallback_content_is_requested_again(fake_chat):
+    """Test that placeholder content from a failed call is not memoized and the next call gets real content."""
+    from core.docstring_engine.generator import generate_contents, generate_docstring
+    from core.docstring_engine.llm_integration import is_fallback
+
+    replies = iter([
+        "no json", "still no json", '{"summary": "Add the numbers."}',
+        "no json", "still no json", '{"summary": "Subtract the numbers."}',
+    ])
+    calls = fake_chat(lambda prompt: next(replies))
+    add = {"name": "add_numbers", "args": [{"name": "a"}], "returns": "int"}
+    sub = {"name": "subtract_numbers", "args": [{"name": "a"}], "returns": "int"}
+
+    assert "Short description of `add_numbers`." in generate_docstring(add)
+    assert "Add the numbers." in generate_docstring(add)
+
+    session = {}
+    assert is_fallback(generate_contents([sub], memo=session)[0])
+    assert session == {}
+    assert generate_contents([sub], memo=session)[0]["summary"] == "Subtract the numbers."
+    assert len(calls) == 6
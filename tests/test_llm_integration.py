@@ -132,4 +132,334 @@ def test_llm_handles_function_without_return(monkeypatch):
     assert isinstance(result, dict)
     assert "returns" in result
     # Returns field should indicate no return value
-    assert result["returns"] is not None or result["returns"] == "None"
\ No newline at end of file
+    assert result["returns"] is not None or result["returns"] == "None"
+
+
+def test_llm_responses_are_cached(fake_chat):
+    """Test that repeated calls for the same function are served from the cache."""
+    from core.docstring_engine.response_cache import default_response_cache
+
+    calls = fake_chat(lambda prompt: '{"summary": "Add.", "args": {}, "returns": "", "raises": {}}')
+    cache = default_response_cache()
+
+    fn = {"name": "add", "args": [{"name": "a"}], "returns": "int", "raises": ["ValueError", "KeyError"]}
+    first = llm_integration.generate_docstring_content(fn)
+    again = llm_integration.generate_docstring_content({**fn, "raises": ["KeyError", "ValueError"]})
+    other = llm_integration.generate_docstring_content({**fn, "returns": "float"})
+
+    assert first == again == other == {"summary": "Add.", "args": {}, "returns": "", "raises": {}}
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_response_cache_ttl_and_eviction(tmp_path):
+    """Test that expired entries miss and the oldest entries are evicted."""
+    from core.docstring_engine.response_cache import LLMResponseCache
+
+    expired = LLMResponseCache(str(tmp_path / "ttl.sqlite"), ttl_seconds=-1)
+    expired.put("k", {"summary": "x"})
+    assert expired.get("k") is None
+
+    bounded = LLMResponseCache(str(tmp_path / "lru.sqlite"), max_entries=2)
+    for key in ("a", "b", "c"):
+        bounded.put(key, {"summary": key})
+    assert bounded.get("a") is None
+    assert bounded.get("c") == {"summary": "c"}
+    assert bounded.stats()["entries"] == 2
+
+
+def test_client_registry_shares_one_client_per_setting(monkeypatch):
+    """Test that clients are built once per provider/model/temperature, even across threads."""
+    import threading
+
+    from core.docstring_engine import clients
+
+    built = []
+
+    class FakeChat:
+        def __init__(self, **kwargs):
+            built.append(kwargs)
+
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(clients, "ChatGroq", FakeChat)
+    registry = clients.ClientRegistry()
+
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(registry.get("groq", "model-a", 0.3))) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(built) == 1
+    assert all(client is seen[0] for client in seen)
+    assert registry.get("groq", "model-a", 0.0) is not seen[0]
+    assert len(registry) == 2
+    with pytest.raises(ValueError):
+        registry.get("unknown", "model-a", 0.3)
+
+
+def test_batched_contents_retry_only_failed_items(fake_chat):
+    """Test that batches share one request and only missing/malformed items are retried."""
+    import asyncio
+    import json
+
+    from core.docstring_engine import metrics
+
+    def reply(prompt):
+        if "Function id:" not in prompt:
+            name = prompt.split("Function name: ")[1].split("\n")[0]
+            return json.dumps({"summary": f"Retry {name}."})
+        items = []
+        for block in prompt.split("Function id: ")[1:]:
+            item_id = block.split("\n")[0]
+            name = block.split("Function name: ")[1].split("\n")[0]
+            if name == "fn2":
+                continue  # missing from the response
+            if name == "fn4":
+                items.append({"id": item_id, "summary": None})  # malformed
+            else:
+                items.append({"id": item_id, "summary": f"Batch {name}."})
+        return "Here you go:\n" + json.dumps(items)
+
+    prompts = fake_chat(reply)
+    functions = [{"name": f"fn{i}", "args": [{"name": "x"}], "returns": "int"} for i in range(6)]
+    functions.append(dict(functions[0]))  # duplicate inputs are requested once
+
+    contents = asyncio.run(llm_integration.agenerate_docstring_contents(functions))
+
+    assert [c["summary"] for c in contents] == [
+        "Batch fn0.", "Batch fn1.", "Retry fn2.", "Batch fn3.", "Retry fn4.", "Batch fn5.", "Batch fn0.",
+    ]
+    assert len(prompts) == 3
+    assert prompts[0].count("Return ONLY") == 1
+    # retried items are not looked up in the cache a second time
+    assert metrics.default_metrics().counters["cache.misses"] == 6
+
+    # every item is cached now; small budgets split work into several batches
+    assert asyncio.run(llm_integration.agenerate_docstring_contents(functions)) == contents
+    items = [(f"f{i}", llm_integration._prompt_inputs(fn)) for i, fn in enumerate(functions)]
+    assert len(llm_integration._plan_batches(items, token_budget=10**6, max_batch_size=3)) == 3
+    assert len(llm_integration._plan_batches(items, token_budget=1, max_batch_size=25)) == len(items)
+
+
+def test_rate_limiter_spaces_requests():
+    """Test that reservations beyond the bucket capacity wait for the refill."""
+    from core.docstring_engine.rate_limit import RateLimiter
+
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600)
+    assert limiter.reserve(300) == 0
+    # 300 tokens left; the 200 missing ones refill at 10 tokens/second
+    assert 19 < limiter.reserve(500) <= 20
+    # the request bucket (60) is far from empty, so only tokens throttled
+    assert limiter.stats()["throttled"] == 1
+    assert limiter.stats()["wait_seconds_total"] > 19
+
+
+def test_invoke_with_retry_honors_retry_after():
+    """Test that 429 responses are retried after Retry-After and other errors are raised."""
+    from core.docstring_engine.rate_limit import RateLimiter, invoke_with_retry
+
+    class RateLimited(Exception):
+        status_code = 429
+        response = type("Response", (), {"headers": {"retry-after": "0.05"}})()
+
+    class FlakyChat:
+        calls = 0
+
+        def invoke(self, messages):
+            FlakyChat.calls += 1
+            if FlakyChat.calls < 3:
+                raise RateLimited("slow down")
+            return "ok"
+
+    limiter = RateLimiter(10**6, 10**9)
+    assert invoke_with_retry(FlakyChat(), [], tokens=10, limiter=limiter) == "ok"
+    stats = limiter.stats()
+    assert (stats["retries"], stats["rate_limited"]) == (2, 2)
+    assert stats["wait_seconds_total"] >= 0.09
+
+    class Broken:
+        def invoke(self, messages):
+            raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        invoke_with_retry(Broken(), [], tokens=10, limiter=limiter)
+    assert limiter.stats()["retries"] == 2
+
+
+def test_llamacpp_pool_loads_once_and_grows_on_demand(monkeypatch):
+    """Test the local backend: warm first instance, bounded pool, chat-style responses."""
+    import asyncio
+    import threading
+
+    from langchain_core.messages import HumanMessage
+
+    from core.docstring_engine import local_llm
+    from core.docstring_engine.clients import ClientRegistry
+
+    loaded = []
+    release = threading.Event()
+
+    class FakeLlamaCpp:
+        def __init__(self, **kwargs):
+            loaded.append(kwargs)
+
+        def invoke(self, prompt):
+            release.wait(1)
+            return f"echo: {prompt}"
+
+    monkeypatch.setattr(local_llm, "_load_llamacpp", lambda **kwargs: FakeLlamaCpp(**kwargs))
+    monkeypatch.setenv("LLAMACPP_POOL_SIZE", "2")
+    monkeypatch.setenv("LLAMACPP_N_THREADS", "4")
+    registry = ClientRegistry()
+
+    pool = registry.get("llamacpp", "/models/model.gguf", 0.3)
+    assert registry.get("llamacpp", "/models/model.gguf", 0.3) is pool
+    assert len(loaded) == 1 and loaded[0]["n_threads"] == 4
+
+    async def run_three():
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        return await asyncio.gather(*(pool.ainvoke([HumanMessage(content=f"p{i}")]) for i in range(3)))
+
+    responses = asyncio.run(run_three())
+    assert [r.content for r in responses] == ["echo: p0", "echo: p1", "echo: p2"]
+    assert len(loaded) == pool.loaded == 2
+
+
+def test_journal_records_requests_and_replays_them_offline(monkeypatch, fake_chat, tmp_path):
+    """Test that journaled responses are served back by the replay provider."""
+    from core.docstring_engine import clients, journal
+    from core.docstring_engine.response_cache import LLMResponseCache
+
+    replies = iter(['{"summary": "Add the numbers.", "args": {"a": "First."}}', "not json", "still not json"])
+    fake_chat(lambda prompt: next(replies), usage={"input_tokens": 210, "output_tokens": 12})
+    path = str(tmp_path / "requests.jsonl")
+    journal.default_journal.set(journal.RequestJournal(path))
+
+    add = {"name": "add", "args": [{"name": "a"}], "returns": "int"}
+    sub = {"name": "sub", "args": [{"name": "a"}], "returns": "int"}
+    recorded = llm_integration.generate_docstring_content(add)
+    llm_integration.generate_docstring_content(sub)
+
+    entries = list(journal.RequestJournal(path).entries())
+    assert [e["outcome"] for e in entries] == ["ok", "unparsed", "fallback"]
+    assert (entries[0]["prompt_tokens"], entries[0]["completion_tokens"]) == (210, 12)
+    assert entries[0]["functions"] == ["add"] and entries[0]["latency_seconds"] >= 0
+
+    journal.default_journal.reset()
+    monkeypatch.setattr(llm_integration, "PROVIDER", "replay")
+    monkeypatch.setattr(llm_integration, "MODEL", "replay")
+    monkeypatch.setenv("LLM_JOURNAL_PATH", path)
+    # replay never consults the response cache, even when it holds an entry for the prompt
+    cache = LLMResponseCache(str(tmp_path / "b.sqlite"))
+    cache.put(llm_integration.content_key(add), {"summary": "Stale."})
+    assert llm_integration.generate_docstring_content(add, cache, clients.ClientRegistry()) == recorded
+    assert cache.stats()["entries"] == 1
+    with pytest.raises(LookupError):
+        llm_integration.generate_docstring_content({**add, "name": "mul"}, cache, clients.ClientRegistry())
+
+
+def test_complex_functions_are_routed_to_the_large_model(monkeypatch, llm_state):
+    """Test routing thresholds, per-model batches and per-model stats."""
+    import asyncio
+    import json
+
+    from core.docstring_engine import clients, routing
+
+    prompts_by_model = {}
+
+    class FakeChat:
+        def __init__(self, model, **kwargs):
+            self.model = model
+
+        async def ainvoke(self, messages):
+            prompt = messages[0].content
+            prompts_by_model.setdefault(self.model, []).append(prompt)
+            ids = [line.split(": ")[1] for line in prompt.splitlines() if line.startswith("Function id: ")]
+            return type("Response", (), {"content": json.dumps([{"id": i, "summary": self.model} for i in ids])})()
+
+    monkeypatch.setattr(clients, "ChatGroq", FakeChat)
+    routing.default_router.set(routing.ModelRouter(max_complexity=5, max_raises=1))
+    monkeypatch.setattr(llm_integration, "MODEL", "small")
+    monkeypatch.setattr(llm_integration, "LARGE_MODEL", "large")
+
+    simple = {"name": "get", "args": [{"name": "self"}], "complexity": 1}
+    branchy = {"name": "plan", "args": [], "complexity": 9}
+    raising = {"name": "load", "args": [], "raises": ["KeyError", "OSError"]}
+    results = asyncio.run(llm_integration.agenerate_docstring_contents([simple, branchy, raising]))
+
+    assert [r["summary"] for r in results] == ["small", "large", "large"]
+    assert len(prompts_by_model["small"]) == len(prompts_by_model["large"]) == 1
+    stats = routing.default_router().stats()
+    assert (stats["small"]["functions"], stats["large"]["functions"]) == (1, 2)
+    assert stats["large"]["requests"] == 1 and stats["large"]["prompt_tokens"] > 0
+
+
+def test_metrics_record_latency_tokens_fallbacks_and_cache_hits(fake_chat, tmp_path):
+    """Test the per-call instrumentation summary and its JSON/CSV export."""
+    import csv
+    import json
+
+    from core.docstring_engine import metrics
+
+    replies = iter(['{"summary": "Add."}', "Sure! Here is the JSON you asked for", "Sorry, no JSON today"])
+    fake_chat(lambda prompt: next(replies), usage={"input_tokens": 200, "output_tokens": 10})
+
+    add = {"name": "add", "args": [], "returns": "int"}
+    llm_integration.generate_docstring_content(add)
+    llm_integration.generate_docstring_content(add)
+    llm_integration.generate_docstring_content({**add, "name": "sub"})
+
+    summary = metrics.default_metrics().summary()
+    assert summary["calls"] == 3 and summary["errors"] == 0
+    assert (summary["prompt_tokens"], summary["completion_tokens"]) == (600, 30)
+    assert summary["fallback_rate"] == round(1 / 3, 4)
+    assert summary["cache_hit_rate"] == round(1 / 3, 4)
+    assert 0 <= summary["latency_seconds"]["p50"] <= summary["latency_seconds"]["p99"]
+    assert metrics.percentile([5, 1, 4, 2, 3], 50) == 3 and metrics.percentile([1, 2, 3], 99) == 3
+
+    exported = json.loads(open(metrics.default_metrics().export_json(str(tmp_path / "m.json"))).read())
+    assert [c["outcome"] for c in exported["calls"]] == ["ok", "unparsed", "fallback"]
+    with open(metrics.default_metrics().export_csv(str(tmp_path / "m.csv")), newline="") as f:
+        assert [row["model"] for row in csv.DictReader(f)] == [llm_integration.MODEL] * 3
+
+
+def test_extract_json_salvages_wrapped_and_sloppy_responses(fake_chat):
+    """Test repair of fenced / prose-wrapped JSON and that only unrepairable responses are retried."""
+    from core.docstring_engine import metrics
+
+    extract = llm_integration.extract_json
+    assert extract('{"summary": "Add."}') == ({"summary": "Add."}, "clean")
+    assert extract('Here you go:\n```json\n{"summary": "Add.", "args": {"a": "x",},}\n```') == (
+        {"summary": "Add.", "args": {"a": "x"}}, "salvaged"
+    )
+    assert extract("Sure! {'summary': 'Don\\'t add.', 'raises': None} Hope it helps [1]") == (
+        {"summary": "Don't add.", "raises": None}, "salvaged"
+    )
+    assert extract("no json at all") == (None, "failed")
+    # stray braces in the prose are skipped until a value passes validation
+    assert llm_integration._parse_content('The function {name} does X. {"summary": "Do X.", "args": {}}') == (
+        {"summary": "Do X.", "args": {}, "returns": "", "raises": {}}, "salvaged"
+    )
+    assert llm_integration._parse_batch_response('See [1] and {id}: [{"id": "f0", "summary": "Do X."}]')[0] == {
+        "f0": {"summary": "Do X.", "args": {}, "returns": "", "raises": {}},
+    }
+    assert llm_integration.validate_content({"summary": " Add. ", "raises": ["KeyError"], "returns": None}) == {
+        "summary": "Add.", "args": {}, "returns": "", "raises": {"KeyError": ""},
+    }
+    assert llm_integration.validate_content({"args": {}}) is None
+
+    replies = iter(["```\n{'summary': 'Add.', 'args': {'a': 'First.'},}\n```", "I cannot help", '{"summary": "Sub."}'])
+    calls = fake_chat(lambda prompt: next(replies))
+    metrics.default_metrics.reset()  # drop the counts of the direct parses above
+
+    add = llm_integration.generate_docstring_content({"name": "add", "args": [{"name": "a"}]})
+    sub = llm_integration.generate_docstring_content({"name": "sub", "args": []})
+
+    assert add["args"] == {"a": "First."} and sub["summary"] == "Sub."
+    assert len(calls) == 3
+    summary = metrics.default_metrics().summary()
+    assert summary["json"] == {"clean": 1, "salvaged": 1, "failed": 1, "salvage_rate": 0.5}
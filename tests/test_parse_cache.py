@@ -0,0 +1,102 @@
+# tests/test_parse_cache.py
+"""Tests for the persistent parse cache."""
+
+from core.parser.cache import ParseCache
+from core.parser.python_parser import parse_path
+
+
+def _write_module(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(body, encoding="utf-8")
+    return path
+
+
+def test_warm_scan_matches_cold_scan(tmp_path):
+    """Test that cached results equal a fresh parse."""
+    _write_module(tmp_path, "a.py", 'def f(x):\n    """Doc."""\n    return x\n')
+    cache_path = str(tmp_path / "cache.sqlite")
+
+    fresh = parse_path(str(tmp_path))
+    with ParseCache(cache_path) as cache:
+        cold = parse_path(str(tmp_path), cache=cache)
+        assert cache.misses == 1
+    with ParseCache(cache_path) as cache:
+        warm = parse_path(str(tmp_path), cache=cache)
+        assert cache.hits == 1 and cache.misses == 0
+
+    assert cold == fresh
+    assert warm == fresh
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    """Test that editing a file invalidates its cached result."""
+    module = _write_module(tmp_path, "a.py", "def f():\n    pass\n")
+    cache_path = str(tmp_path / "cache.sqlite")
+
+    with ParseCache(cache_path) as cache:
+        parse_path(str(tmp_path), cache=cache)
+
+    module.write_text("def f():\n    pass\n\n\ndef g():\n    pass\n", encoding="utf-8")
+    with ParseCache(cache_path) as cache:
+        results = parse_path(str(tmp_path), cache=cache)
+        assert cache.misses == 1
+
+    assert [fn["name"] for fn in results[0]["functions"]] == ["f", "g"]
+
+
+def test_identical_content_shares_entry(tmp_path):
+    """Test that copies of a file hit the same entry but keep their own path."""
+    a = _write_module(tmp_path, "a.py", "def f():\n    pass\n")
+    b = _write_module(tmp_path, "b.py", "def f():\n    pass\n")
+
+    with ParseCache(str(tmp_path / "cache.sqlite")) as cache:
+        first = parse_path(str(a), cache=cache)
+        second = parse_path(str(b), cache=cache)
+        assert cache.hits == 1
+
+    assert first[0]["file_path"] == str(a)
+    assert second[0]["file_path"] == str(b)
+
+
+def test_eviction_bounds_entry_count(tmp_path):
+    """Test that least recently used entries are evicted past max_entries."""
+    for i in range(5):
+        _write_module(tmp_path, f"m{i}.py", f"def f{i}():\n    pass\n")
+
+    with ParseCache(str(tmp_path / "cache.sqlite"), max_entries=2) as cache:
+        parse_path(str(tmp_path), cache=cache)
+        count = cache._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    assert count == 2
+
+
+def test_parser_version_bump_rebuilds_unchanged_files(tmp_path, monkeypatch):
+    """Test that records from an older parser are never served, even for unchanged files."""
+    import json
+
+    from core.parser import cache as cache_module
+
+    _write_module(tmp_path, "a.py", "def f(x):\n    return x\n")
+    cache_path = str(tmp_path / "cache.sqlite")
+
+    monkeypatch.setattr(cache_module, "PARSER_VERSION", "old")
+    with ParseCache(cache_path) as cache:
+        parse_path(str(tmp_path), cache=cache)
+        # what an older parser stored: records without the newer fields
+        (key, data), = cache._conn.execute("SELECT key, data FROM entries").fetchall()
+        old = json.loads(data)
+        for fn in old["functions"]:
+            del fn["body_shape"]
+        cache._conn.execute("UPDATE entries SET data = ? WHERE key = ?", (json.dumps(old), key))
+
+    monkeypatch.undo()
+    with ParseCache(cache_path) as cache:
+        results = parse_path(str(tmp_path), cache=cache)
+        assert (cache.hits, cache.misses) == (0, 1)
+    assert results == parse_path(str(tmp_path))
+
+    # an unreadable entry under the current version is a miss, not a crash
+    with ParseCache(cache_path) as cache:
+        cache._conn.execute("UPDATE entries SET data = ?", (json.dumps({"functions": [{"name": "f", "args": [{}]}]}),))
+        assert parse_path(str(tmp_path), cache=cache) == results
+        assert cache.misses == 1
@@ -105,4 +105,109 @@ def test_docstring_detection():
         if len(unique_values) == 1:
             # All functions have same docstring status - this is valid!
             # It means either all are documented or all are undocumented
-            pass
\ No newline at end of file
+            pass
+
+
+def test_nested_function_metrics():
+    """Test that nested functions fold into their enclosing function's metrics."""
+    import ast
+    from core.parser.python_parser import parse_functions
+
+    source = """
+def outer(x):
+    if x:
+        def inner(y):
+            for i in y:
+                if i:
+                    raise ValueError(i)
+            yield y
+    return x and not x
+"""
+    funcs = {fn["name"]: fn for fn in parse_functions(ast.parse(source))}
+    assert [fn["name"] for fn in parse_functions(ast.parse(source))] == ["outer", "inner"]
+
+    assert funcs["inner"]["complexity"] == 3
+    assert funcs["inner"]["nesting_depth"] == 3
+    assert funcs["inner"]["raises"] == ["ValueError(i)"]
+    assert funcs["inner"]["yields"] is True
+
+    # outer counts its own if + boolean op plus everything inside inner
+    assert funcs["outer"]["complexity"] == 5
+    assert funcs["outer"]["nesting_depth"] == 5
+    assert funcs["outer"]["raises"] == ["ValueError(i)"]
+    assert funcs["outer"]["yields"] is True
+
+
+def test_class_methods_reuse_function_records():
+    """Test that class methods are linked to the module-level function records."""
+    results = parse_file("examples/sample_a.py")
+    processor = next(c for c in results["classes"] if c["name"] == "Processor")
+
+    assert [m["name"] for m in processor["methods"]] == ["process"]
+    assert any(m is fn for m in processor["methods"] for fn in results["functions"])
+
+
+def test_parallel_parse_matches_sequential():
+    """Test that a process-pool scan returns the same results in the same order."""
+    sequential = parse_path("examples")
+    parallel = parse_path("examples", jobs=2)
+
+    assert [f["file_path"] for f in parallel] == [f["file_path"] for f in sequential]
+    assert [len(f["functions"]) for f in parallel] == [len(f["functions"]) for f in sequential]
+
+
+def test_function_records_behave_like_dicts():
+    """Test dict-style access and JSON conversion of parsed records."""
+    import json
+    import pickle
+    from core.parser.records import FunctionInfo, to_jsonable
+
+    fn = next(fn for fn in parse_file("examples/sample_a.py")["functions"] if fn["name"] == "add")
+    assert isinstance(fn, FunctionInfo)
+    assert fn.get("returns") == "int"
+    assert fn.get("missing", "x") == "x"
+    assert fn["args"][0]["annotation"] == "int"
+
+    fn["file_path"] = "examples/sample_a.py"
+    assert "file_path" in fn
+    data = fn.to_dict()
+    assert data["file_path"] == "examples/sample_a.py"
+    assert data["args"] == [{"name": "a", "annotation": "int", "default": None},
+                            {"name": "b", "annotation": "int", "default": None}]
+    assert json.loads(json.dumps(fn, default=to_jsonable)) == data
+    assert pickle.loads(pickle.dumps(fn)) == fn
+
+
+def test_expressions_are_rendered_on_first_read(tmp_path):
+    """Test that annotations, defaults and raises are unparsed lazily but identically."""
+    from core.parser.records import LazyExpr
+
+    module = tmp_path / "lazy.py"
+    module.write_text(
+        "@cache(maxsize = 2)\n"
+        "def f(a: Dict[str,int], b=(1,2), c: int = 0) -> Optional['X']:\n"
+        "    raise ValueError('bad')\n",
+        encoding="utf-8",
+    )
+    fn = parse_file(str(module))["functions"][0]
+
+    assert isinstance(fn._raw("returns"), LazyExpr)
+    assert fn["args"][2]._raw("annotation") == "int"
+
+    assert fn["decorators"] == ["cache(maxsize=2)"]
+    assert [a["annotation"] for a in fn["args"]] == ["Dict[str, int]", None, "int"]
+    assert [a["default"] for a in fn["args"]] == [None, "(1, 2)", "0"]
+    assert fn["returns"] == "Optional['X']"
+    assert fn["raises"] == ["ValueError('bad')"]
+
+
+def test_source_unit_segments_non_ascii_lines():
+    """Test that AST byte offsets map to the right text on non-ASCII lines."""
+    import ast
+    from core.parser.source_unit import SourceUnit
+
+    unit = SourceUnit("mem.py", "x = 'é'\ndef f(a: 'ü' = \"ñ\"): pass\n")
+    fn = unit.tree.body[1]
+    assert unit.segment(fn.args.args[0].annotation) == "'ü'"
+    assert unit.segment(fn.args.defaults[0]) == '"ñ"'
+    assert unit.segment(unit.tree.body[0].value) == "'é'"
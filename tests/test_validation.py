@@ -120,4 +120,20 @@ def test_validator_with_valid_docstrings():
     # If errors exist, verify they're actionable
     for error in errors:
         if isinstance(error, str):
-            assert len(error) > 10, "Error messages should be descriptive"
\ No newline at end of file
+            assert len(error) > 10, "Error messages should be descriptive"
+
+
+def test_review_file_matches_separate_checks():
+    """Test that the single-read review pipeline matches the individual checks."""
+    from core.parser.python_parser import parse_file
+    from core.validator.validator import compute_maintainability, review_file
+
+    path = "examples/sample_b.py"
+    with open(path, "r", encoding="utf-8") as fh:
+        source = fh.read()
+
+    review = review_file(path)
+    assert review["functions"] == parse_file(path)["functions"]
+    assert review["docstring_violations"] == validate_docstrings(path)
+    assert review["complexity_details"] == compute_complexity(source)
+    assert review["maintainability"] == compute_maintainability(source)